@@ -0,0 +1,34 @@
+import pytest
+
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+
+from tests.test_cases import benchmark_model
+
+# Backend.INTERPRETERS isn't compared, as it falls back to the PATHOS backend on the supported versions of Python
+BACKENDS = [Backend.MULTIPROCESSING, Backend.PATHOS, Backend.THREADS]
+
+model = Model(
+    initial_state=benchmark_model.states,
+    state_update_blocks=benchmark_model.state_update_blocks,
+    params=benchmark_model.params,
+)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_benchmark_startup(benchmark, backend):
+    # A single short run, so that the time is dominated by starting the workers
+    experiment = Experiment(Simulation(model=model, timesteps=1, runs=1))
+    experiment.engine = Engine(backend=backend)
+    benchmark.pedantic(experiment.run, iterations=1, rounds=5)
+    benchmark.extra_info["time_to_first_result"] = experiment.engine.time_to_first_result
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_benchmark_throughput(benchmark, backend):
+    # Many runs on a persistent pool, so that the time is dominated by executing and transferring runs
+    experiment = Experiment(Simulation(model=model, timesteps=1_000, runs=20))
+    with Engine(backend=backend, persistent_pool=True) as engine:
+        experiment.engine = engine
+        experiment.run()
+        benchmark.pedantic(experiment.run, iterations=1, rounds=3)
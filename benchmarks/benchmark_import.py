@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+
+def test_benchmark_import_radcad(benchmark):
+    benchmark.pedantic(import_radcad, iterations=1, rounds=5)
+    # Execution backends (e.g. Ray) are imported when selected, not by `import radcad`
+    assert benchmark.stats.stats.min < 1.0
+
+
+def import_radcad():
+    subprocess.check_call([sys.executable, "-c", "import radcad"])
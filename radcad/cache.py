@@ -0,0 +1,248 @@
+from functools import lru_cache, partial
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import sysconfig
+import tempfile
+import types
+
+import numpy as np
+
+
+# Functions and classes of the standard library and installed packages are hashed by name, rather than by their code
+_LIBRARY_PATHS = tuple({sysconfig.get_paths()[name] for name in ("stdlib", "platstdlib", "purelib", "platlib")})
+# The fraction of `max_size` the cache is evicted to once it exceeds `max_size`, so that the cache directory isn't scanned on every put
+_EVICTION_RATIO = 0.9
+
+
+class UnhashableValueError(TypeError):
+    """
+    Raised by `stable_hash()` for values that can't be hashed by their contents, e.g. objects that can't be pickled.
+    """
+
+
+def stable_hash(*values):
+    """
+    A hash of the values that is stable across processes and sessions: dicts and sets are hashed independently of their order,
+    and functions by their code, defaults, closures, and the global values they reference
+    (including the attributes of modules, e.g. `helpers.compute`, and the methods of classes).
+
+    Other values are hashed by their pickled representation, and `UnhashableValueError` is raised for values that can't be pickled.
+    """
+    digest = hashlib.sha256()
+    for value in values:
+        _update(digest, value, set())
+    return digest.hexdigest()
+
+
+def _update(digest, value, seen):
+    digest.update(type(value).__qualname__.encode())
+    if isinstance(value, dict):
+        items = sorted(((stable_hash(key), value[key]) for key in value), key=lambda item: item[0])
+        digest.update(str(len(items)).encode())
+        for key_hash, item in items:
+            digest.update(key_hash.encode())
+            _update(digest, item, seen)
+    elif isinstance(value, (list, tuple)):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            _update(digest, item, seen)
+    elif isinstance(value, (set, frozenset)):
+        for item_hash in sorted(stable_hash(item) for item in value):
+            digest.update(item_hash.encode())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, types.FunctionType):
+        _update_function(digest, value, seen)
+    elif isinstance(value, types.MethodType):
+        _update(digest, value.__func__, seen)
+        _update(digest, value.__self__, seen)
+    elif isinstance(value, partial):
+        _update(digest, (value.func, value.args, value.keywords), seen)
+    elif isinstance(value, types.CodeType):
+        _update_code(digest, value)
+    else:
+        # Hashing the `repr()` instead could give values with the same `repr()` (e.g. truncated arrays) the same hash
+        try:
+            digest.update(pickle.dumps(value, protocol=4))
+        except Exception as error:
+            raise UnhashableValueError(f"Value of type {type(value).__qualname__} can't be hashed: {error}") from error
+
+
+def _update_function(digest, function, seen):
+    digest.update(f"{function.__module__}.{function.__qualname__}".encode())
+    # Recursive functions are hashed once
+    if function in seen or _is_library(function.__module__):
+        return
+    seen.add(function)
+    _update_code(digest, function.__code__)
+    _update(digest, (function.__defaults__, function.__kwdefaults__), seen)
+    for cell in function.__closure__ or ():
+        try:
+            _update(digest, cell.cell_contents, seen)
+        except ValueError:
+            # Empty cell
+            pass
+    names = _code_names(function.__code__)
+    for name in names:
+        # Names that aren't globals are builtins or attributes
+        if name in function.__globals__:
+            digest.update(name.encode())
+            _update_global(digest, function.__globals__[name], names, seen)
+
+
+def _update_global(digest, value, names, seen):
+    if isinstance(value, types.ModuleType):
+        digest.update(value.__name__.encode())
+        if value in seen:
+            return
+        seen.add(value)
+        # Only the module attributes named by the function, e.g. `compute` for `helpers.compute`
+        attributes = vars(value)
+        for name in names:
+            if name in attributes:
+                digest.update(name.encode())
+                _update_global(digest, attributes[name], names, seen)
+    elif isinstance(value, type):
+        digest.update(f"{value.__module__}.{value.__qualname__}".encode())
+        if value in seen or _is_library(value.__module__):
+            return
+        seen.add(value)
+        for (name, attribute) in sorted(vars(value).items()):
+            if isinstance(attribute, (staticmethod, classmethod)):
+                attribute = attribute.__func__
+            if isinstance(attribute, types.FunctionType):
+                digest.update(name.encode())
+                _update(digest, attribute, seen)
+    else:
+        # Functions, constants, and tables (e.g. a dict or array) referenced by the function
+        _update(digest, value, seen)
+
+
+@lru_cache(maxsize=None)
+def _is_library(module_name):
+    package = str(module_name).partition(".")[0]
+    if package in sys.builtin_module_names:
+        return True
+    # e.g. `__main__` in a notebook, without a file
+    path = getattr(sys.modules.get(package), "__file__", None)
+    return path is not None and path.startswith(_LIBRARY_PATHS)
+
+
+def _code_names(code):
+    """
+    The global and attribute names referenced by the code, including nested code (e.g. comprehensions and lambdas).
+    """
+    names = list(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names.extend(name for name in _code_names(constant) if name not in names)
+    return names
+
+
+def _update_code(digest, code):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            _update_code(digest, constant)
+        else:
+            digest.update(repr(constant).encode())
+
+
+class ResultCache:
+    """
+    An on-disk cache of the results of each run, keyed by a `stable_hash()` of the model's state update blocks,
+    the initial state, the parameter subset, the number of timesteps, the simulation, run and subset indices,
+    and the Engine options that change the results.
+
+    Once the files in the cache directory exceed `max_size` bytes, the least recently used results are evicted.
+    The number of cache `hits` and `misses` are counted across experiments.
+    """
+
+    def __init__(self, path, max_size=1024**3):
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+        # The size of the cache is tracked as results are put, and the cache directory is only scanned when evicting
+        self._size = self.size()
+
+    def get(self, key):
+        """
+        Return the cached results for the key, or None.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                results = pickle.load(file)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        # The modification time records when the results were last used
+        os.utime(path)
+        self.hits += 1
+        return results
+
+    def put(self, key, results):
+        """
+        Cache the results for the key, unless the results can't be pickled, e.g. a state variable holding a lambda.
+        """
+        try:
+            data = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            logging.warning(f"Run results not cached, as they can't be pickled: {error}")
+            return
+        # Written to a temporary file and then renamed, so that a partially written file is never read
+        path = self._path(key)
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+                size = len(data)
+            try:
+                replaced_size = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced_size = 0
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        self._size += size - replaced_size
+        if self._size > self.max_size:
+            self._evict()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": self.size()}
+
+    def size(self):
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def clear(self):
+        for entry in self._entries():
+            os.remove(entry.path)
+        self._size = 0
+
+    def _path(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def _entries(self):
+        return [entry for entry in os.scandir(self.path) if entry.name.endswith(".pkl")]
+
+    def _evict(self):
+        # The least recently used results are evicted until the cache is below `max_size`, with room for further results
+        entries = sorted(((entry.stat(), entry.path) for entry in self._entries()), key=lambda entry: entry[0].st_mtime)
+        size = sum(stat.st_size for (stat, _path) in entries)
+        for (stat, path) in entries:
+            if size <= self.max_size * _EVICTION_RATIO:
+                break
+            size -= stat.st_size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._size = size
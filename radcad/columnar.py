@@ -0,0 +1,172 @@
+import numpy as np
+
+
+RUN_METADATA = ("simulation", "subset", "run")
+
+
+def _dtype_for(value):
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(np.bool_)
+    if isinstance(value, (int, np.integer)):
+        return np.asarray(value).dtype
+    if isinstance(value, (float, complex, np.floating, np.complexfloating)):
+        return np.asarray(value).dtype
+    return np.dtype(object)
+
+
+class Column:
+    """
+    A growable column of state values, stored in a NumPy array.
+
+    Numeric values are stored using a numeric dtype, which is promoted as required (e.g. int64 to float64),
+    and any other values fall back to an object array.
+    """
+
+    def __init__(self, capacity=64):
+        self._capacity = capacity
+        self._data = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def dtype(self):
+        return self._data.dtype if self._data is not None else None
+
+    @property
+    def values(self):
+        if self._data is None:
+            return np.empty(0, dtype=object)
+        return self._data[: self._size]
+
+    @staticmethod
+    def from_array(array):
+        column = Column()
+        column._data = array
+        column._size = len(array)
+        return column
+
+    def append(self, value):
+        dtype = _dtype_for(value)
+        if self._data is None:
+            self._data = np.empty(self._capacity, dtype=dtype)
+        elif dtype != self._data.dtype and self._data.dtype != object:
+            self._promote(dtype)
+        if self._size == len(self._data):
+            self._grow()
+        self._data[self._size] = value
+        self._size += 1
+
+    def _promote(self, dtype):
+        if dtype == object:
+            promoted = np.dtype(object)
+        else:
+            promoted = np.promote_types(self._data.dtype, dtype)
+        if promoted != self._data.dtype:
+            self._data = self._data.astype(promoted)
+
+    def _grow(self):
+        data = np.empty(len(self._data) * 2, dtype=self._data.dtype)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+
+
+class ColumnarRun:
+    """
+    The results of a single run, stored as one column per state variable.
+
+    The run metadata (simulation, subset, and run) is stored once per run, rather than once per record.
+    """
+
+    def __init__(self, simulation=None, subset=None, run=None):
+        self.simulation = simulation
+        self.subset = subset
+        self.run = run
+        self.keys = []
+        self.columns = {}
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        if key in RUN_METADATA:
+            return np.full(self._length, getattr(self, key))
+        return self.columns[key].values
+
+    def append(self, record: dict):
+        if not self.keys:
+            self.keys = list(record.keys())
+            for key in RUN_METADATA:
+                setattr(self, key, record.get(key))
+            self.columns = {key: Column() for key in self.keys if key not in RUN_METADATA}
+        for key, column in self.columns.items():
+            column.append(record[key])
+        self._length += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def to_records(self):
+        columns = {key: self[key] for key in self.keys}
+        return [
+            {key: columns[key][index] for key in self.keys}
+            for index in range(self._length)
+        ]
+
+    @staticmethod
+    def from_records(records):
+        run = ColumnarRun()
+        run.extend(records)
+        return run
+
+    @staticmethod
+    def from_arrays(keys, arrays: dict, simulation=None, subset=None, run=None):
+        columnar_run = ColumnarRun(simulation, subset, run)
+        columnar_run.keys = list(keys)
+        columnar_run.columns = {
+            key: Column.from_array(array) for (key, array) in arrays.items() if key not in RUN_METADATA
+        }
+        columnar_run._length = len(next(iter(arrays.values()))) if arrays else 0
+        return columnar_run
+
+
+class ColumnarResults:
+    """
+    Experiment results stored as a columnar table, one `ColumnarRun` per run.
+
+    Use `to_dataframe()` to convert the results to a Pandas DataFrame without an intermediate list of records.
+    """
+
+    def __init__(self, runs=[]):
+        self.runs = [run for run in runs if len(run)]
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def __iter__(self):
+        return iter(self.runs)
+
+    @property
+    def columns(self):
+        # The union of the state keys of each run, e.g. of simulations of different models
+        return list(dict.fromkeys(key for run in self.runs for key in run.keys))
+
+    def __getitem__(self, key):
+        if not any(key in run.keys for run in self.runs):
+            raise KeyError(key)
+        # Missing values are filled with NaN, as by `pd.DataFrame(records)`
+        return np.concatenate([
+            run[key] if key in run.keys else np.full(len(run), np.nan)
+            for run in self.runs
+        ])
+
+    def to_records(self):
+        return [record for run in self.runs for record in run.to_records()]
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame({key: self[key] for key in self.columns}, columns=self.columns)
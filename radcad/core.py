@@ -1,14 +1,61 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import copy
-from functools import reduce, partial
+from functools import partial
 import logging
+import operator
+import os
 import pickle
 import traceback
 
+from radcad.columnar import Column, ColumnarRun, RUN_METADATA
+from radcad.history import StateHistory
+from radcad.state import CopyOnWriteState, copy_state, materialize
+from radcad.utils import flatten
 
-def _update_state(initial_state, params, substep, result, substate, signals, state_update_tuple):
-    state, function = state_update_tuple
-    if not state in initial_state:
-        raise KeyError("Invalid state key in partial state update block")
+import numpy as np
+
+
+# The minimum number of state variables for which substates are copied on write, rather than copied as plain dicts
+COPY_ON_WRITE_STATE_SIZE = 512
+
+
+class ExecutionPlan(tuple):
+    """
+    State update blocks compiled into a flat tuple of `(policies, variables, reduce_policies)` per substep,
+    where `variables` is a tuple of `(state key, state update function)` pairs.
+    """
+
+
+def compile_state_update_blocks(
+    initial_state: dict,
+    state_update_blocks: list,
+    debug: bool = False,
+    deepcopy: bool = True,
+    concurrent_policies: bool = False,
+):
+    plan = []
+    for psu in state_update_blocks:
+        policies = tuple(psu["policies"].values())
+        # Policy signals are aggregated using the block's policy aggregation, or summed
+        reduce_policies = _policy_reducer(
+            policies,
+            psu.get("aggregation", "sum"),
+            deepcopy,
+            psu.get("concurrent", concurrent_policies),
+        )
+        variables = []
+        for (state, function) in psu["variables"].items():
+            if not state in initial_state:
+                raise KeyError("Invalid state key in partial state update block")
+            if debug:
+                function = partial(_checked_state_update, initial_state, state, function)
+            variables.append((state, function))
+        plan.append((policies, tuple(variables), reduce_policies))
+    return ExecutionPlan(plan)
+
+
+def _checked_state_update(initial_state, state, function, params, substep, result, substate, signals):
     state_key, state_value = function(
         params, substep, result, substate, signals
     )
@@ -35,48 +82,98 @@ def _single_run(
     params: dict,
     deepcopy: bool,
     drop_substeps: bool,
+    copy_strategies: dict = {},
+    runs: int = 1,
+    subsets: int = 1,
+    save_every: int = 1,
+    reducers: dict = {},
+    exclude: frozenset = frozenset(),
+    history_window: int = None,
 ):
     logging.info(f"Starting run {run}")
 
+    if not isinstance(state_update_blocks, ExecutionPlan):
+        state_update_blocks = compile_state_update_blocks(initial_state, state_update_blocks, deepcopy=deepcopy)
+
+    # Copying a plain dict is faster than a copy-on-write substate, unless the state is large
+    copy_on_write = len(initial_state) >= COPY_ON_WRITE_STATE_SIZE
+
     initial_state["simulation"] = simulation
-    initial_state["subset"] = subset
-    initial_state["run"] = run + 1
+    # Vectorized runs are ordered by subset, and then by run
+    initial_state["subset"] = subset if subsets == 1 else np.repeat(np.arange(subset, subset + subsets), runs)
+    initial_state["run"] = run + 1 if runs == 1 else np.tile(np.arange(run + 1, run + runs + 1), subsets)
     initial_state["substep"] = 0
     initial_state["timestep"] = 0
 
-    result.append([initial_state])
+    # Windowed reducers: key -> (state key, reducer), applied to the final state of each timestep since the last recorded timestep
+    reducers = {key: (state, _window_reducer(reducer)) for (key, (state, reducer)) in reducers.items()}
+    windows = {key: [] for key in reducers}
+    initial_state.update({key: reducer([initial_state[state]]) for (key, (state, reducer)) in reducers.items()})
+
+    # The state history passed to policy and state update functions, at full resolution, whichever timesteps are recorded:
+    # all the timesteps, or the last `history_window` timesteps
+    history = StateHistory([[initial_state]] if history_window is None else deque([[initial_state]], maxlen=history_window))
+    # Recorded timesteps are appended to the columns of a columnar run as the run goes, or to a list of substeps
+    record = result.extend if isinstance(result, ColumnarRun) else result.append
+    record(_exclude_state([initial_state], exclude) if exclude else [initial_state])
+    # The final state of the previous timestep, also retained when the state history is empty (`history_window=0`)
+    previous_state = initial_state
 
     for timestep in range(0, timesteps):
-        previous_state: dict = (
-            result[0][0].copy()
-            if timestep == 0
-            else result[-1][-1:][0].copy()
-        )
+        # Copy-on-write substates share the final state of the previous timestep, a plain dict, as their base
+        substate = CopyOnWriteState(previous_state) if copy_on_write else previous_state
 
         substeps: list = []
 
-        for (substep, psu) in enumerate(state_update_blocks):
-            substate: dict = (
-                previous_state.copy() if substep == 0 else substeps[substep - 1].copy()
-            )
-            substate_copy = pickle.loads(pickle.dumps(substate, -1)) if deepcopy else substate.copy()
-            substate["substep"] = substep + 1
+        for (substep, (policies, variables, reduce_policies)) in enumerate(state_update_blocks):
+            # Policy and state update functions receive a plain dict, with each state variable copied using its copy strategy
+            substate_copy = copy_state(copy_strategies, substate) if deepcopy else materialize(substate.copy())
+            substate = substate.copy()
 
-            signals: dict = reduce_signals(
-                params, substep, result, substate_copy, psu
+            signals: dict = reduce_policies(
+                params, substep, history, substate_copy, policies
             )
 
-            updated_state = map(
-                partial(_update_state, initial_state, params, substep, result, substate_copy, signals),
-                psu["variables"].items()
-            )
-            substate.update(updated_state)
-            substate["timestep"] = timestep + 1
+            updated_state = [
+                (state, function(params, substep, history, substate_copy, signals)[1])
+                for (state, function) in variables
+            ]
+            substate.update(updated_state, substep=substep + 1, timestep=timestep + 1)
             substeps.append(substate)
-        result.append(substeps if not drop_substeps else [substeps.pop()])
+        if copy_on_write and substeps:
+            substeps[-1] = substeps[-1].to_dict()
+        substeps = substeps if not drop_substeps else [substeps.pop()]
+        history.append(substeps)
+        previous_state = substeps[-1]
+
+        is_recorded = (timestep + 1) % save_every == 0
+        if reducers:
+            final_state = substeps[-1]
+            for (key, (state, _reducer)) in reducers.items():
+                windows[key].append(final_state[state])
+            if is_recorded:
+                aggregates = {key: reducer(windows[key]) for (key, (_state, reducer)) in reducers.items()}
+                for window in windows.values():
+                    window.clear()
+                for recorded_substate in substeps:
+                    recorded_substate.update(aggregates)
+        # The excluded state variables are removed from the recorded copy, and retained in the state history
+        if is_recorded:
+            record(_exclude_state(substeps, exclude) if exclude else substeps)
     return result
 
 
+def _exclude_state(substeps: list, exclude: frozenset):
+    return [{key: value for (key, value) in substate.items() if key not in exclude} for substate in substeps]
+
+
+def _window_reducer(reducer):
+    if isinstance(reducer, str):
+        function = getattr(np, reducer)
+        return lambda values: function(values, axis=0)
+    return reducer
+
+
 def single_run(
     simulation,
     timesteps,
@@ -87,23 +184,43 @@ def single_run(
     params,
     deepcopy: bool,
     drop_substeps: bool,
+    columnar: bool = False,
+    copy_strategies: dict = {},
+    runs: int = 1,
+    subsets: int = 1,
+    save_every: int = 1,
+    reducers: dict = {},
+    exclude: frozenset = frozenset(),
+    history_window: int = None,
 ):
-    result = []
+    # Vectorized runs and subsets: state variables are stacked along a leading `run` axis of length `runs * subsets`
+    batch_size = runs * subsets
+    result = ColumnarRun() if columnar and batch_size == 1 else []
+    if batch_size > 1:
+        initial_state = vectorize_state(initial_state, batch_size)
 
     try:
+        _single_run(
+            result,
+            simulation,
+            timesteps,
+            run,
+            subset,
+            initial_state,
+            state_update_blocks,
+            params,
+            deepcopy,
+            drop_substeps,
+            copy_strategies,
+            runs,
+            subsets,
+            save_every,
+            reducers,
+            exclude,
+            history_window,
+        )
         return (
-            _single_run(
-                result,
-                simulation,
-                timesteps,
-                run,
-                subset,
-                initial_state,
-                state_update_blocks,
-                params,
-                deepcopy,
-                drop_substeps
-            ),
+            _format_result(result, columnar, batch_size),
             None, # Error
             None, # Traceback
         )
@@ -113,7 +230,109 @@ def single_run(
         logging.warning(
             f"Simulation {simulation} / run {run} / subset {subset} failed! Returning partial results if Engine.raise_exceptions == False."
         )
-        return (result, error, trace)
+        return (_format_result(result, columnar, batch_size), error, trace)
+
+
+def _format_result(result: list, columnar: bool, runs: int = 1):
+    if runs > 1 and columnar:
+        return split_columnar_runs(flatten(result), runs)
+    if runs > 1:
+        return [_format_result(run_result, columnar) for run_result in split_runs(result, runs)]
+    if isinstance(result, ColumnarRun):
+        return result
+    else:
+        return [[materialize(substate) for substate in substeps] for substeps in result]
+
+
+def vectorize_parameter_sweep(params: dict, param_sweep: list, runs: int = 1):
+    """
+    Combine a parameter sweep into a single parameter set, where each swept parameter is an array along a leading `subset` axis,
+    with each value repeated for `runs` vectorized Monte Carlo runs.
+    """
+    return {
+        key: np.repeat(np.asarray([param_set[key] for param_set in param_sweep]), runs, axis=0)
+        if len(value) > 1 else param_sweep[0][key]
+        for (key, value) in params.items()
+    }
+
+
+def _is_numeric(value):
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in "biufc"
+    return isinstance(value, (bool, int, float, complex, np.number, np.bool_))
+
+
+def vectorize_state(state: dict, runs: int):
+    """
+    Stack each numeric state variable along a new leading axis of length `runs`.
+    Other state variables are shared by all runs.
+    """
+    return {
+        key: np.repeat(np.asarray(value)[np.newaxis], runs, axis=0) if _is_numeric(value) else value
+        for (key, value) in state.items()
+    }
+
+
+def _split_state(state, runs: int):
+    batched = {}
+    for (key, value) in state.items():
+        if isinstance(value, np.ndarray) and value.ndim and value.shape[0] == runs:
+            batched[key] = value.tolist() if value.ndim == 1 else list(value)
+    return [
+        {key: batched[key][index] if key in batched else value for (key, value) in state.items()}
+        for index in range(runs)
+    ]
+
+
+def _object_array(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def split_columnar_runs(records: list, runs: int):
+    """
+    Split the records of a vectorized run into a `ColumnarRun` per Monte Carlo run,
+    slicing the stacked state variables rather than creating a record per run.
+    """
+    keys = list(records[0].keys()) if records else []
+    run_columns = [{} for _ in range(runs)]
+    for key in keys:
+        values = [record[key] for record in records]
+        batched = [isinstance(value, np.ndarray) and value.ndim and value.shape[0] == runs for value in values]
+        if all(batched):
+            stacked = np.stack(values, axis=1)
+            for (index, columns) in enumerate(run_columns):
+                columns[key] = stacked[index] if stacked.ndim == 2 else _object_array(list(stacked[index]))
+        else:
+            # State variables without a `run` axis are shared by all runs
+            split = any(batched)
+            arrays = []
+            for index in range(runs if split else 1):
+                column = Column()
+                for (value, is_batched) in zip(values, batched):
+                    column.append(value[index] if is_batched else value)
+                arrays.append(column.values)
+            for (index, columns) in enumerate(run_columns):
+                columns[key] = arrays[index if split else 0]
+    return [
+        ColumnarRun.from_arrays(keys, columns, *(columns[key][0] for key in RUN_METADATA))
+        if records else ColumnarRun()
+        for columns in run_columns
+    ]
+
+
+def split_runs(result: list, runs: int):
+    """
+    Split the result of a vectorized run into the results of each of the `runs` Monte Carlo runs,
+    indexing state variables with a leading axis of length `runs`.
+    """
+    run_results = [[] for _ in range(runs)]
+    for substeps in result:
+        split_substeps = [_split_state(substate, runs) for substate in substeps]
+        for (index, run_result) in enumerate(run_results):
+            run_result.append([substates[index] for substates in split_substeps])
+    return run_results
 
 
 def generate_parameter_sweep(params: dict):
@@ -137,23 +356,108 @@ def generate_parameter_sweep(params: dict):
     return param_sweep
 
 
-def _add_signals(acc, a: {}):
-    for (key, value) in a.items():
-        if acc.get(key, None):
-            acc[key] += value
-        else:
-            acc[key] = value
-    return acc
+def reduce_signals(params: dict, substep: int, result: list, substate: dict, psu: dict):
+    policies = tuple(psu["policies"].values())
+    reduce_policies = _policy_reducer(policies, psu.get("aggregation", "sum"), concurrent=psu.get("concurrent", False))
+    return reduce_policies(params, substep, result, substate, policies)
 
 
-def reduce_signals(params: dict, substep: int, result: list, substate: dict, psu: dict):
-    policy_results: [dict] = list(map(lambda function: function(params, substep, result, substate), psu["policies"].values()))
+def _policy_reducer(policies: tuple, aggregation="sum", deepcopy: bool = True, concurrent: bool = False):
+    if len(policies) == 0:
+        return _reduce_no_policies
+    elif len(policies) == 1:
+        return _reduce_single_policy if deepcopy else _reduce_single_policy_no_copy
+    elif concurrent:
+        return partial(_reduce_policies_concurrently, _signal_aggregator(aggregation))
+    else:
+        return partial(_reduce_policies, _signal_aggregator(aggregation))
 
-    result: dict = {}
-    result_length = len(policy_results)
-    if result_length == 0:
-        return result
-    elif result_length == 1:
-        return pickle.loads(pickle.dumps(policy_results[0], -1))
+
+def _reduce_no_policies(params, substep, result, substate, policies):
+    return {}
+
+
+def _reduce_single_policy(params, substep, result, substate, policies):
+    return pickle.loads(pickle.dumps(policies[0](params, substep, result, substate), -1))
+
+
+def _reduce_single_policy_no_copy(params, substep, result, substate, policies):
+    return policies[0](params, substep, result, substate)
+
+
+def _reduce_policies(aggregate, params, substep, result, substate, policies):
+    signals = {}
+    # Signals aggregated into arrays allocated by the aggregation, which can be updated in place
+    owned = set()
+    for function in policies:
+        aggregate(signals, owned, function(params, substep, result, substate))
+    return signals
+
+
+def _reduce_policies_concurrently(aggregate, params, substep, result, substate, policies):
+    executor = _policy_executor()
+    futures = [executor.submit(function, params, substep, result, substate) for function in policies[1:]]
+    signals = {}
+    owned = set()
+    try:
+        aggregate(signals, owned, policies[0](params, substep, result, substate))
+    finally:
+        # Signals are aggregated in the order of the policies, once all the policies have completed
+        policy_results = [future.result() for future in futures]
+    for policy_result in policy_results:
+        aggregate(signals, owned, policy_result)
+    return signals
+
+
+_executor = None
+
+
+def _policy_executor():
+    # Each process has its own thread pool, which isn't inherited by forked worker processes
+    global _executor
+    if _executor is None or _executor[0] != os.getpid():
+        _executor = (os.getpid(), ThreadPoolExecutor(thread_name_prefix="radcad-policy"))
+    return _executor[1]
+
+
+def _concat(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.concatenate([a, b])
+    return a + b
+
+
+# Policy aggregation -> (function used to aggregate two signals, NumPy ufunc used to aggregate arrays in place)
+_signal_aggregations = {
+    "sum": (operator.add, np.add),
+    "product": (operator.mul, np.multiply),
+    "max": (max, np.maximum),
+    "min": (min, np.minimum),
+    "concat": (_concat, None),
+}
+
+
+def _signal_aggregator(aggregation):
+    if isinstance(aggregation, np.ufunc):
+        return partial(_aggregate_signals, aggregation, aggregation)
+    elif callable(aggregation):
+        return partial(_aggregate_signals, aggregation, None)
+    elif aggregation in _signal_aggregations:
+        return partial(_aggregate_signals, *_signal_aggregations[aggregation])
     else:
-        return reduce(_add_signals, policy_results, result)
+        raise Exception(
+            f"Invalid policy aggregation {aggregation}, must be a function or one of {list(_signal_aggregations)}"
+        )
+
+
+def _aggregate_signals(combine, ufunc, acc: dict, owned: set, signals: dict):
+    for (key, value) in signals.items():
+        if not key in acc:
+            acc[key] = value
+        elif ufunc is None or not (isinstance(acc[key], np.ndarray) or isinstance(value, np.ndarray)):
+            acc[key] = combine(acc[key], value)
+        elif key in owned and np.shape(value) in (acc[key].shape, ()) and np.result_type(acc[key], value) == acc[key].dtype:
+            ufunc(acc[key], value, out=acc[key])
+        else:
+            acc[key] = ufunc(acc[key], value)
+            owned.add(key)
+    return acc
@@ -1,21 +1,43 @@
 import radcad.core as core
 import radcad.wrappers as wrappers
-from radcad.utils import flatten, extract_exceptions
+from radcad.utils import flatten, extract_exceptions, reorder, reorder_async
+from radcad.columnar import ColumnarResults
+from radcad.cache import stable_hash, UnhashableValueError
 
+import asyncio
+import concurrent.futures
+import hashlib
 import multiprocessing
-
-# Pathos re-writes the core code in Python rather than C, for ease of maintenance at cost of performance
-from pathos.multiprocessing import ProcessPool as PathosPool
-import dill
-
-import ray
+import pickle
+import shutil
+import sys
+import threading
+try:
+    from multiprocessing import shared_memory, resource_tracker
+except ImportError:
+    # Python < 3.8: shared model components are sent with each task
+    shared_memory = None
 
 from enum import Enum
+from functools import lru_cache
+from traceback import format_exc
 import copy
+import itertools
+import logging
+import time
 
 
 cpu_count = multiprocessing.cpu_count() - 1 or 1
 
+# The `RunArgs` fields published once per experiment, rather than sent with each task
+SHARED_RUN_ARGS = ("initial_state", "state_update_blocks", "parameters", "copy_strategies", "reducers")
+# The fraction of the free shared memory that the model components may use, otherwise they are sent with each task
+SHARED_MEMORY_RATIO = 0.5
+# The Experiment hooks that may mutate the initial state and parameters of the runs planned after them
+RUN_HOOKS = ("before_simulation", "after_simulation", "before_run", "after_run", "before_subset", "after_subset")
+# Shared memory block name -> model components, cached by each worker process for the current experiment
+_shared_components = {}
+
 
 class Backend(Enum):
     DEFAULT = 0
@@ -24,6 +46,109 @@ class Backend(Enum):
     RAY_REMOTE = 3
     PATHOS = 4
     SINGLE_PROCESS = 5
+    THREADS = 6
+    # Experimental: sub-interpreters on Python 3.14+, otherwise an alias of PATHOS
+    INTERPRETERS = 7
+
+
+class CostScheduler:
+    """
+    Schedule runs longest first, using a cost estimated from the number of timesteps and runs, the size of the model,
+    and the observed duration of earlier runs of the same model, so that the longest runs start first,
+    and idle processes take the shorter runs that remain.
+
+    Durations are observed as runs complete, and used to schedule subsequent experiments.
+    """
+
+    def __init__(self, smoothing=0.5):
+        self.smoothing = smoothing
+        # Model (a `stable_hash()` of its state update blocks) -> observed seconds per unit of work
+        self._rates = {}
+
+    def order(self, models, run_args):
+        costs = [self.estimate(model, args) for (model, args) in zip(models, run_args)]
+        return sorted(range(len(run_args)), key=lambda position: -costs[position])
+
+    def estimate(self, model, run_args):
+        rates = self._rates.values()
+        default_rate = sum(rates) / len(rates) if rates else 1.0
+        return CostScheduler._work(run_args) * self._rates.get(model, default_rate)
+
+    def observe(self, model, run_args, duration):
+        # Models that can't be hashed aren't identified across experiments
+        if model is None:
+            return
+        rate = duration / CostScheduler._work(run_args)
+        if model in self._rates:
+            rate = self.smoothing * rate + (1 - self.smoothing) * self._rates[model]
+        self._rates[model] = rate
+
+    def _work(run_args):
+        functions = sum(len(policies) + len(variables) for (policies, variables, *_) in run_args.state_update_blocks)
+        return max(run_args.timesteps, 1) * max(functions, 1) * run_args.runs * run_args.subsets
+
+
+def _shared_memory_free():
+    """
+    The free space of the filesystem backing shared memory blocks on Linux, which is limited in size (e.g. 64 MB in a Docker container),
+    or None if unknown.
+    """
+    try:
+        return shutil.disk_usage("/dev/shm").free
+    except OSError:
+        return None
+
+
+def _snapshots():
+    """
+    Return a function copying a value as a run is planned, which returns the same copy for values with the same contents,
+    so that the runs planned with unchanged values still share them, and they are published once.
+    """
+    snapshots = {}
+
+    def snapshot(value):
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return copy.deepcopy(value)
+        key = hashlib.sha256(data).digest()
+        if key not in snapshots:
+            snapshots[key] = pickle.loads(data)
+        return snapshots[key]
+
+    return snapshot
+
+
+@lru_cache(maxsize=None)
+def _ray_proxy():
+    """
+    The Ray remote function proxying `Engine._proxy_single_run_ray()`, created on first use of a Ray backend.
+    """
+    import ray
+
+    return ray.remote(Engine._proxy_single_run_ray)
+
+
+def _import_core():
+    import radcad.core
+
+
+@lru_cache(maxsize=None)
+def _interpreters_supported():
+    """
+    Whether runs can be executed in sub-interpreters: Python 3.14+, and extension modules imported by radCAD (e.g. NumPy)
+    that support being loaded in isolated sub-interpreters.
+    """
+    try:
+        from concurrent.futures import InterpreterPoolExecutor
+    except ImportError:
+        return False
+    try:
+        with InterpreterPoolExecutor(max_workers=1) as executor:
+            executor.submit(_import_core).result()
+    except Exception:
+        return False
+    return True
 
 
 class Engine:
@@ -34,11 +159,96 @@ class Engine:
         self.raise_exceptions = kwargs.pop("raise_exceptions", True)
         self.deepcopy = kwargs.pop("deepcopy", True)
         self.drop_substeps = kwargs.pop("drop_substeps", False)
+        self.columnar = kwargs.pop("columnar", False)
+        self.debug = kwargs.pop("debug", False)
+        self.vectorize_runs = kwargs.pop("vectorize_runs", False)
+        self.vectorize_subsets = kwargs.pop("vectorize_subsets", False)
+        self.sink = kwargs.pop("sink", None)
+        self.save_every = kwargs.pop("save_every", 1)
+        self.reducers = kwargs.pop("reducers", {})
+        self.history_window = kwargs.pop("history_window", None)
+        self.concurrent_policies = kwargs.pop("concurrent_policies", False)
+        self.chunksize = kwargs.pop("chunksize", 1)
+        self.scheduler = kwargs.pop("scheduler", None)
+        self.cache = kwargs.pop("cache", None)
+        self.persistent_pool = kwargs.pop("persistent_pool", False)
+        # The maximum number of Ray tasks in flight, or None for twice the number of CPUs of the Ray cluster
+        self.max_pending_tasks = kwargs.pop("max_pending_tasks", None)
+        self.time_to_first_result = None
+        self._pool = None
+        # The number of asynchronous experiments executing on the pool
+        self._pool_experiments = 0
 
         if kwargs:
             raise Exception(f"Invalid Engine option in {kwargs}")
 
     def _run(self, experiment=None, **kwargs):
+        self._prepare(experiment, **kwargs)
+
+        self.experiment._before_experiment(experiment=self.experiment)
+
+        # When using a result sink, the results are written to the sink rather than retained
+        result = [
+            ([] if self.sink else results, metadata)
+            for results, metadata in self._run_results(ordered=True)
+        ]
+
+        return self._collect_results(self.experiment, result)
+
+    def _run_iter(self, experiment=None, ordered=False, **kwargs):
+        """
+        Yield the `(context, result)` of each run as soon as it completes, in completion order,
+        or in the same order as `Engine._run()` if `ordered` is True.
+        The results of each run are not retained, but the exceptions are collected in `Experiment.exceptions`.
+        """
+        self._prepare(experiment, **kwargs)
+        self.experiment.results = []
+        self.experiment.exceptions = []
+
+        self.experiment._before_experiment(experiment=self.experiment)
+
+        for results, metadata in self._run_results(ordered=ordered):
+            self.experiment.exceptions.append(metadata)
+            yield Engine._get_context(metadata), results
+
+        self.experiment._after_experiment(experiment=self.experiment)
+
+    async def _run_async(self, experiment=None, **kwargs):
+        self._prepare(experiment, **kwargs)
+
+        experiment._before_experiment(experiment=experiment)
+
+        result = [
+            ([] if self.sink else results, metadata)
+            async for results, metadata in self._run_results_async(experiment, ordered=True)
+        ]
+
+        return self._collect_results(experiment, result)
+
+    async def _run_iter_async(self, experiment=None, ordered=False, **kwargs):
+        """
+        The asynchronous equivalent of `Engine._run_iter()`, awaiting the completion of each run without blocking the event loop.
+        """
+        self._prepare(experiment, **kwargs)
+        experiment.results = []
+        experiment.exceptions = []
+
+        experiment._before_experiment(experiment=experiment)
+
+        async for results, metadata in self._run_results_async(experiment, ordered=ordered):
+            experiment.exceptions.append(metadata)
+            yield Engine._get_context(metadata), results
+
+        experiment._after_experiment(experiment=experiment)
+
+    def _collect_results(self, experiment, result):
+        experiment.results, experiment.exceptions = extract_exceptions(result)
+        if self.columnar:
+            experiment.results = ColumnarResults(experiment.results)
+        experiment._after_experiment(experiment=experiment)
+        return experiment.results
+
+    def _prepare(self, experiment=None, **kwargs):
         if not experiment:
             raise Exception("Experiment required as argument")
         self.experiment = experiment
@@ -46,82 +256,588 @@ class Engine:
         if kwargs:
             raise Exception(f"Invalid Engine option in {kwargs}")
 
-        simulations = experiment.simulations
         if not isinstance(self.backend, Backend):
             raise Exception(f"Execution backend must be one of {Backend.list()}")
-        configs = [
+
+        if not isinstance(self.save_every, int) or self.save_every < 1:
+            raise Exception("Engine save_every option must be a positive integer")
+
+        if self.history_window is not None and (not isinstance(self.history_window, int) or self.history_window < 0):
+            raise Exception("Engine history_window option must be None or a non-negative integer")
+
+        if self.max_pending_tasks is not None and (not isinstance(self.max_pending_tasks, int) or self.max_pending_tasks < 1):
+            raise Exception("Engine max_pending_tasks option must be None or a positive integer")
+
+        if self.chunksize != "auto" and (not isinstance(self.chunksize, int) or self.chunksize < 1):
+            raise Exception("Engine chunksize option must be a positive integer or 'auto'")
+
+    def _run_results(self, ordered=False):
+        def completed_runs():
+            run_args, models, chunks, tasks, components, keys, cached = self._plan()
+            start = time.perf_counter()
+            self.time_to_first_result = None
+            # Cached runs complete first, and only the other runs are executed
+            yield from cached.items()
+            if not tasks:
+                return
+            for index, chunk_results, durations in self._execute(tasks, components):
+                yield from self._completed_chunk(start, run_args, models, keys, chunks[index], chunk_results, durations)
+
+        # Runs are indexed by position, so that results completed out of order can be reordered
+        # A scheduler orders the runs once they have all been planned
+        if self._execution_backend() == Backend.SINGLE_PROCESS and not self.scheduler:
+            completed = self._single_process_runs()
+        else:
+            completed = completed_runs()
+        if ordered:
+            completed = reorder(completed)
+
+        sink = self.sink
+        if sink:
+            sink.open(self.experiment)
+        try:
+            for _position, run_results in completed:
+                for results, metadata in self._format_run_results(run_results):
+                    if sink:
+                        sink.write(Engine._get_context(metadata), results)
+                    yield results, metadata
+        finally:
+            if sink:
+                sink.close()
+
+    async def _run_results_async(self, experiment, ordered=False):
+        # The experiment is planned before the first `await`, so that concurrent experiments don't share `Engine.experiment`
+        run_args, models, chunks, tasks, components, keys, cached = self._plan()
+        loop = asyncio.get_running_loop()
+        execution = self._execute_async(tasks, components)
+
+        async def completed_runs():
+            start = time.perf_counter()
+            self.time_to_first_result = None
+            for completed in cached.items():
+                yield completed
+            if not tasks:
+                return
+            async for index, chunk_results, durations in execution:
+                for completed in self._completed_chunk(start, run_args, models, keys, chunks[index], chunk_results, durations):
+                    yield completed
+
+        completed = completed_runs()
+        if ordered:
+            completed = reorder_async(completed)
+
+        # The sink's writer may apply backpressure, so it is called from a thread rather than the event loop
+        sink = self.sink
+        if sink:
+            await loop.run_in_executor(None, sink.open, experiment)
+        try:
+            async for _position, run_results in completed:
+                for results, metadata in self._format_run_results(run_results):
+                    if sink:
+                        await loop.run_in_executor(None, sink.write, Engine._get_context(metadata), results)
+                    yield results, metadata
+        finally:
+            # Outstanding runs are cancelled when the experiment is cancelled, or the iterator is closed early
+            await execution.aclose()
+            if sink:
+                await loop.run_in_executor(None, sink.close)
+
+    def _single_process_runs(self):
+        """
+        Execute each run as its run arguments are generated, returning the `(position, results)` of each run,
+        so that the hooks after each run and subset are called once it has completed, as the runs are executed one at a time.
+        """
+        start = time.perf_counter()
+        self.time_to_first_result = None
+        models = self._model_keys()
+        for position, args in enumerate(self._run_stream(self._configs())):
+            model = models[args.simulation]
+            key = self._cache_key(args, model) if self.cache and args.runs * args.subsets == 1 else None
+            results = self.cache.get(key) if key else None
+            if results is not None:
+                yield position, results
+                continue
+            components, shared_run_args = Engine._share_run_args([args])
+            _index, chunk_results, durations = Engine._proxy_single_run(
+                (position, [(shared_run_args[0], self.raise_exceptions)], components)
+            )
+            yield from self._completed_chunk(
+                start, {position: args}, {position: model}, {position: key}, [position], chunk_results, durations
+            )
+
+    def _configs(self):
+        return [
             (
-                sim.model.initial_state,
-                sim.model.state_update_blocks,
-                sim.model.params,
+                sim.model,
                 sim.timesteps,
                 sim.runs,
             )
-            for sim in simulations
+            for sim in self.experiment.simulations
         ]
 
-        result = []
+    def _model_keys(self):
+        """
+        A `stable_hash()` of the state update blocks of each simulation, identifying the model for the scheduler and the result cache,
+        hashed once per experiment, or None if the state update blocks can't be hashed.
+        """
+        if not (self.scheduler or self.cache):
+            return [None] * len(self.experiment.simulations)
+        return [self._stable_hash(simulation.model.state_update_blocks) for simulation in self.experiment.simulations]
 
-        self.experiment._before_experiment(experiment=self.experiment)
+    def _stable_hash(self, *values):
+        # Runs whose model, initial state, or parameters can't be hashed are executed without the cache
+        try:
+            return stable_hash(*values)
+        except UnhashableValueError as error:
+            logging.info(f"Run not cached: {error}")
+            return None
 
-        run_generator = self._run_stream(configs)
+    def _plan(self):
+        """
+        Generate the run arguments of the experiment, ordered by the scheduler,
+        and the tasks that execute them in chunks, returning `(run_args, models, chunks, tasks, components, keys, cached)`,
+        where `keys` are the result cache keys of the runs, and `cached` maps the positions of cached runs to their results.
 
-        if self.backend in [Backend.RAY, Backend.RAY_REMOTE]:
-            if self.backend == Backend.RAY_REMOTE:
-                print(
-                    "Using Ray remote backend, please ensure you've initialized Ray using ray.init(address=***, ...)"
-                )
+        All the run arguments are generated, calling the hooks before and after each run and subset, before any run is executed.
+        """
+        run_args = list(self._run_stream(self._configs()))
+        model_keys = self._model_keys()
+        models = [model_keys[args.simulation] for args in run_args]
+        # The positions of the runs in the order they are submitted, e.g. longest first
+        positions = list(range(len(run_args)))
+        if self.scheduler:
+            positions = self.scheduler.order(models, run_args)
+
+        keys = [None] * len(run_args)
+        cached = {}
+        if self.cache:
+            for position, args in enumerate(run_args):
+                # Vectorized runs are not cached
+                if args.runs * args.subsets == 1:
+                    keys[position] = self._cache_key(args, models[position])
+                    results = self.cache.get(keys[position]) if keys[position] else None
+                    if results is not None:
+                        cached[position] = results
+            positions = [position for position in positions if position not in cached]
+
+        # The model components are published once, and each task only references them
+        components, shared_run_args = Engine._share_run_args(run_args)
+
+        chunksize = self._get_chunksize(len(positions))
+        chunks = [positions[start : start + chunksize] for start in range(0, len(positions), chunksize)]
+        tasks = [
+            (index, [(shared_run_args[position], self.raise_exceptions) for position in chunk])
+            for index, chunk in enumerate(chunks)
+        ]
+        return run_args, models, chunks, tasks, components, keys, cached
+
+    def _cache_key(self, run_args, model):
+        if model is None:
+            return None
+        return self._stable_hash(
+            model,
+            run_args.initial_state,
+            run_args.parameters,
+            run_args.timesteps,
+            run_args.simulation,
+            run_args.run,
+            run_args.subset,
+            # Engine options that change the results
+            self.drop_substeps,
+            self.columnar,
+            self.save_every,
+            self.reducers,
+            run_args.exclude,
+            self.history_window,
+        )
+
+    def _completed_chunk(self, start, run_args, models, keys, chunk, chunk_results, durations):
+        """
+        Record the completion of a chunk of runs, returning the `(position, results)` of each run.
+        """
+        if self.time_to_first_result is None:
+            self.time_to_first_result = time.perf_counter() - start
+            logging.info(f"Time to first result: {self.time_to_first_result:.3f}s")
+        if self.scheduler:
+            for position, duration in zip(chunk, durations):
+                self.scheduler.observe(models[position], run_args[position], duration)
+        if self.cache:
+            for position, run_results in zip(chunk, chunk_results):
+                # Runs that failed are not cached
+                if keys[position] and not any(metadata['exception'] for _results, metadata in run_results):
+                    self.cache.put(keys[position], run_results)
+        return zip(chunk, chunk_results)
+
+    def _format_run_results(self, run_results):
+        # Each run returns the results of one or more vectorized runs
+        for results, metadata in run_results:
+            yield (results if self.columnar else flatten(results)), metadata
+
+    def _get_chunksize(self, tasks):
+        if self.chunksize == "auto":
+            # Similar to `multiprocessing.Pool.map()`, approximately four chunks per process
+            chunksize, remainder = divmod(tasks, self.processes * 4)
+            return chunksize + 1 if remainder else max(chunksize, 1)
+        return self.chunksize
+
+    def _get_context(metadata):
+        return wrappers.Context(
+            metadata['simulation'],
+            metadata['run'],
+            metadata['subset'],
+            metadata['timesteps'],
+            metadata['initial_state'],
+            metadata['parameters'],
+        )
+
+    def _share_run_args(run_args):
+        """
+        Replace the model components of each `RunArgs` with an index into a list of the distinct components,
+        so that components shared by many runs (e.g. the state update blocks, or the parameters of a subset) are only transferred once.
+        """
+        components = []
+        indices = {}
+
+        def index(component):
+            if id(component) not in indices:
+                indices[id(component)] = len(components)
+                components.append(component)
+            return indices[id(component)]
+
+        shared_run_args = [
+            args._replace(**{field: index(getattr(args, field)) for field in SHARED_RUN_ARGS})
+            for args in run_args
+        ]
+        return components, shared_run_args
+
+    def _resolve_run_args(run_args, components):
+        run_args = run_args._replace(**{field: components[getattr(run_args, field)] for field in SHARED_RUN_ARGS})
+        # Each run mutates its own copy of the initial state and parameters
+        return run_args._replace(
+            initial_state=copy.deepcopy(run_args.initial_state),
+            parameters=copy.deepcopy(run_args.parameters),
+        )
+
+    def _publish(components):
+        """
+        Publish the model components to a shared memory block, returning the block and the `(name, size)` sent with each task,
+        or no block and the components themselves if shared memory is not available, or doesn't have room for the components.
+        """
+        if shared_memory is None:
+            return None, components
+        import dill
+
+        data = dill.dumps(components)
+        free = _shared_memory_free()
+        # Writing past the size of the shared memory filesystem raises SIGBUS, rather than an exception
+        if free is not None and len(data) > free * SHARED_MEMORY_RATIO:
+            logging.info(f"Model components ({len(data)} bytes) sent with each task, as shared memory only has {free} bytes free")
+            return None, components
+        block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        block.buf[: len(data)] = data
+        return block, (block.name, len(data))
+
+    def _unpublish(block):
+        if block is None:
+            return
+        block.close()
+        block.unlink()
+
+    def _load_components(shared):
+        if not isinstance(shared, tuple):
+            return shared
+        name, size = shared
+        if name not in _shared_components:
+            import dill
+
+            if sys.version_info >= (3, 13):
+                # Only the process that created the block tracks it, e.g. not each sub-interpreter
+                block = shared_memory.SharedMemory(name=name, track=False)
             else:
-                ray.init(num_cpus=self.processes, ignore_reinit_error=True)
+                block = shared_memory.SharedMemory(name=name)
+            try:
+                components = dill.loads(bytes(block.buf[:size]))
+            finally:
+                block.close()
+            # Only the components of the current experiment are cached
+            _shared_components.clear()
+            _shared_components[name] = components
+        return _shared_components[name]
+
+    def _execute(self, tasks, components):
+        """
+        Execute the tasks using the selected backend, yielding the `(index, results, durations)` of each task in completion order.
+        The model components referenced by the tasks are published once: to the Ray object store,
+        or to shared memory for process pools, where each worker loads them once per experiment.
+        """
+        backend = self._execution_backend()
+        if backend in [Backend.RAY, Backend.RAY_REMOTE]:
+            ray, proxy_single_run_ray, max_pending_tasks = self._init_ray()
 
+            shared = ray.put(components)
+            pending = iter(tasks)
             futures = [
-                Engine._proxy_single_run_ray.remote((config, self.raise_exceptions))
-                for config in run_generator
-            ]
-            result = ray.get(futures)
-        elif self.backend in [Backend.PATHOS, Backend.DEFAULT]:
-            with PathosPool(self.processes) as pool:
-                result = pool.map(
-                    Engine._proxy_single_run,
-                    [
-                        (config, self.raise_exceptions)
-                        for config in run_generator
-                    ],
-                )
-                pool.close()
-                pool.join()
-                pool.clear()
-        elif self.backend in [Backend.MULTIPROCESSING]:
-            with multiprocessing.get_context("spawn").Pool(
-                processes=self.processes
-            ) as pool:
-                result = pool.map(
-                    Engine._proxy_single_run,
-                    [
-                        (config, self.raise_exceptions)
-                        for config in run_generator
-                    ],
-                )
-                pool.close()
-                pool.join()
-        elif self.backend in [Backend.SINGLE_PROCESS]:
-            result = [
-                Engine._proxy_single_run((config, self.raise_exceptions))
-                for config in run_generator
+                proxy_single_run_ray.remote(task, shared)
+                for task in itertools.islice(pending, max_pending_tasks)
             ]
+            try:
+                while futures:
+                    ready, futures = ray.wait(futures, num_returns=1)
+                    futures.extend(
+                        proxy_single_run_ray.remote(task, shared)
+                        for task in itertools.islice(pending, 1)
+                    )
+                    yield ray.get(ready[0])
+            finally:
+                for future in futures:
+                    ray.cancel(future)
+        elif backend in [Backend.PATHOS, Backend.DEFAULT, Backend.MULTIPROCESSING]:
+            pool = self._get_pool(backend)
+            block, shared = Engine._publish(components)
+            tasks = [(*task, shared) for task in tasks]
+            try:
+                if backend == Backend.MULTIPROCESSING:
+                    yield from pool.imap_unordered(Engine._proxy_single_run, tasks)
+                else:
+                    yield from pool.uimap(Engine._proxy_single_run, tasks)
+            except BaseException:
+                # Outstanding tasks are terminated, and a persistent pool is recreated by the next run
+                self._close_pool(terminate=True)
+                raise
+            finally:
+                Engine._unpublish(block)
+            if not self.persistent_pool:
+                self._close_pool()
+        elif backend in [Backend.THREADS, Backend.INTERPRETERS]:
+            executor = self._get_pool(backend)
+            run, block, shared, load = Engine._executor_task(backend, components)
+            futures = [executor.submit(run, (*task, shared)) for task in tasks]
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    yield load(future.result())
+            finally:
+                for future in futures:
+                    future.cancel()
+                Engine._unpublish(block)
+            if not self.persistent_pool:
+                self._close_pool()
+        elif backend in [Backend.SINGLE_PROCESS]:
+            for task in tasks:
+                yield Engine._proxy_single_run((*task, components))
         else:
-            raise Exception(f"Execution backend must be one of {Backend._member_names_}, not {self.backend}")
-        
-        self.experiment.results, self.experiment.exceptions = extract_exceptions(result)
-        self.experiment._after_experiment(experiment=self.experiment)
-        return self.experiment.results
+            raise Exception(f"Execution backend must be one of {Backend._member_names_}, not {backend}")
+
+    async def _execute_async(self, tasks, components):
+        """
+        The asynchronous equivalent of `Engine._execute()`, awaiting the completion of each task without blocking the event loop.
+        Outstanding tasks are cancelled when the generator is closed, e.g. when the awaiting task is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        backend = self._execution_backend()
+        if backend in [Backend.RAY, Backend.RAY_REMOTE]:
+            ray, proxy_single_run_ray, max_pending_tasks = self._init_ray()
+
+            shared = ray.put(components)
+            pending = iter(tasks)
+            # asyncio future -> Ray object reference
+            futures = {}
+
+            def submit(task):
+                ref = proxy_single_run_ray.remote(task, shared)
+                futures[asyncio.wrap_future(ref.future())] = ref
+
+            for task in itertools.islice(pending, max_pending_tasks):
+                submit(task)
+            try:
+                while futures:
+                    done, _pending = await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        del futures[future]
+                        for task in itertools.islice(pending, 1):
+                            submit(task)
+                        yield future.result()
+            finally:
+                for future, ref in futures.items():
+                    future.cancel()
+                    ray.cancel(ref)
+        elif backend in [Backend.PATHOS, Backend.DEFAULT, Backend.MULTIPROCESSING]:
+            pool = self._get_pool(backend)
+            block, shared = Engine._publish(components)
+            completed = asyncio.Queue()
+
+            def complete(result, error=None):
+                # Called from the pool's result thread, possibly after the event loop is closed
+                try:
+                    loop.call_soon_threadsafe(completed.put_nowait, (result, error))
+                except RuntimeError:
+                    pass
 
-    @ray.remote
-    def _proxy_single_run_ray(args):
-        return Engine._proxy_single_run(args)
-    
-    def _proxy_single_run(args):
-        return Engine._single_run(args)
+            def collect():
+                # Pathos pools don't accept completion callbacks, so the unordered results are collected by a thread
+                try:
+                    for result in pool.uimap(Engine._proxy_single_run, [(*task, shared) for task in tasks]):
+                        complete(result)
+                except BaseException as error:
+                    complete(None, error)
+
+            self._pool_experiments += 1
+            try:
+                if backend == Backend.MULTIPROCESSING:
+                    for task in tasks:
+                        pool.apply_async(
+                            Engine._proxy_single_run,
+                            ((*task, shared),),
+                            callback=complete,
+                            error_callback=lambda error: complete(None, error),
+                        )
+                else:
+                    threading.Thread(target=collect, daemon=True).start()
+                for _task in tasks:
+                    result, error = await completed.get()
+                    if error is not None:
+                        raise error
+                    yield result
+            except BaseException:
+                # Outstanding tasks are terminated, unless the pool is executing other experiments
+                if self._pool_experiments == 1:
+                    self._close_pool(terminate=True)
+                raise
+            finally:
+                self._pool_experiments -= 1
+                Engine._unpublish(block)
+            if not self.persistent_pool and not self._pool_experiments:
+                self._close_pool()
+        elif backend in [Backend.THREADS, Backend.INTERPRETERS]:
+            executor = self._get_pool(backend)
+            run, block, shared, load = Engine._executor_task(backend, components)
+            futures = [loop.run_in_executor(executor, run, (*task, shared)) for task in tasks]
+            self._pool_experiments += 1
+            try:
+                for future in asyncio.as_completed(futures):
+                    yield load(await future)
+            finally:
+                self._pool_experiments -= 1
+                for future in futures:
+                    future.cancel()
+                Engine._unpublish(block)
+            if not self.persistent_pool and not self._pool_experiments:
+                self._close_pool()
+        elif backend in [Backend.SINGLE_PROCESS]:
+            # Runs are executed in a thread, one at a time
+            for task in tasks:
+                yield await loop.run_in_executor(None, Engine._proxy_single_run, (*task, components))
+        else:
+            raise Exception(f"Execution backend must be one of {Backend._member_names_}, not {backend}")
+
+    def _execution_backend(self):
+        """
+        The backend used to execute the experiment: the selected backend,
+        or `Backend.PATHOS` if `Backend.INTERPRETERS` is selected but sub-interpreters are not supported.
+        """
+        if self.backend == Backend.INTERPRETERS and not _interpreters_supported():
+            logging.warning("Sub-interpreters are not supported by this version of Python, or by an extension module imported by radCAD, using the PATHOS backend")
+            return Backend.PATHOS
+        return self.backend
+
+    def _executor_task(backend, components):
+        """
+        Return the function executing each task on a thread or sub-interpreter pool, the shared memory block and shared components
+        referenced by each task, and the function loading the result of each task.
+        """
+        if backend == Backend.THREADS:
+            # Threads share the model components, so that tasks and results are not serialized
+            return Engine._proxy_single_run, None, components, lambda result: result
+        # Sub-interpreters don't share objects: the components are published to shared memory,
+        # and the results of each task are returned as a single pickled buffer
+        block, shared = Engine._publish(components)
+        return Engine._proxy_single_run_interpreter, block, shared, pickle.loads
+
+    def _init_ray(self):
+        """
+        Import and initialize Ray, returning the `ray` module, the remote proxy function, and the maximum number of tasks in flight.
+        """
+        # Execution backends are imported when selected, so that `import radcad` doesn't initialize Ray
+        import ray
+
+        if self.backend == Backend.RAY_REMOTE:
+            print(
+                "Using Ray remote backend, please ensure you've initialized Ray using ray.init(address=***, ...)"
+            )
+        else:
+            ray.init(num_cpus=self.processes, ignore_reinit_error=True)
+
+        # Tasks are submitted as earlier tasks complete, so that the results held by the object store are bounded
+        max_pending_tasks = self.max_pending_tasks or 2 * int(ray.cluster_resources().get("CPU", self.processes))
+        return ray, _ray_proxy(), max_pending_tasks
+
+    def _get_pool(self, backend):
+        if self._pool is not None and self._pool[0] != backend:
+            self._close_pool()
+        if self._pool is None and backend == Backend.THREADS:
+            self._pool = (backend, concurrent.futures.ThreadPoolExecutor(max_workers=self.processes))
+        if self._pool is None and backend == Backend.INTERPRETERS:
+            self._pool = (backend, concurrent.futures.InterpreterPoolExecutor(max_workers=self.processes))
+        if self._pool is None:
+            if shared_memory is not None:
+                # Workers share the resource tracker of this process, which tracks the shared memory blocks until unlinked
+                resource_tracker.ensure_running()
+            if backend == Backend.MULTIPROCESSING:
+                pool = multiprocessing.get_context("spawn").Pool(processes=self.processes)
+            else:
+                # Pathos re-writes the core code in Python rather than C, for ease of maintenance at cost of performance
+                from pathos.multiprocessing import ProcessPool as PathosPool
+
+                pool = PathosPool(self.processes)
+            self._pool = (backend, pool)
+        return self._pool[1]
+
+    def _close_pool(self, terminate=False):
+        if self._pool is None:
+            return
+        backend, pool = self._pool
+        self._pool = None
+        if backend in [Backend.THREADS, Backend.INTERPRETERS]:
+            # Running threads can't be terminated, so outstanding runs are cancelled by the caller
+            pool.shutdown(wait=not terminate)
+            return
+        if terminate:
+            pool.terminate()
+        else:
+            pool.close()
+            pool.join()
+        if backend != Backend.MULTIPROCESSING:
+            # Pathos caches its pools, which are removed once closed
+            pool.clear()
+
+    def close(self):
+        """
+        Close the worker processes of a persistent pool.
+        """
+        self._close_pool()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _proxy_single_run_ray(task, components):
+        # Ray resolves the components from the shared object store
+        return Engine._proxy_single_run((*task, components))
+
+    def _proxy_single_run_interpreter(task):
+        return pickle.dumps(Engine._proxy_single_run(task), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _proxy_single_run(task):
+        index, chunk, shared = task
+        components = Engine._load_components(shared)
+        results = []
+        durations = []
+        for run_args, raise_exceptions in chunk:
+            start = time.perf_counter()
+            results.append(Engine._single_run((Engine._resolve_run_args(run_args, components), raise_exceptions)))
+            durations.append(time.perf_counter() - start)
+        return index, results, durations
 
     def _single_run(args):
         run_args, raise_exceptions = args
@@ -130,31 +846,45 @@ class Engine:
             if raise_exceptions and exception:
                 raise exception
             else:
-                return results, {
+                # Vectorized runs return the results of each run, ordered by subset and then by run
+                run_results = results if run_args.runs * run_args.subsets > 1 else [results]
+                return [
+                    (results, {
                         'exception': exception,
                         'traceback': traceback,
                         'simulation': run_args.simulation,
-                        'run': run_args.run,
-                        'subset': run_args.subset,
+                        'run': run_args.run + run_index % run_args.runs,
+                        'subset': run_args.subset + run_index // run_args.runs,
                         'timesteps': run_args.timesteps,
                         'parameters': run_args.parameters,
                         'initial_state': run_args.initial_state,
-                    }
+                    })
+                    for run_index, results in enumerate(run_results)
+                ]
         except Exception as e:
             if raise_exceptions:
                 raise e
             else:
-                return [], e
+                return [([], {
+                    'exception': e,
+                    'traceback': format_exc(),
+                    'simulation': run_args.simulation,
+                    'run': run_args.run,
+                    'subset': run_args.subset,
+                    'timesteps': run_args.timesteps,
+                    'parameters': run_args.parameters,
+                    'initial_state': run_args.initial_state,
+                })]
 
     def _get_simulation_from_config(config):
-        states, state_update_blocks, params, timesteps, runs = config
-        model = wrappers.Model(
-            initial_state=states, state_update_blocks=state_update_blocks, params=params
-        )
-        return wrappers.Simulation(model=model, timesteps=timesteps, runs=runs)
+        model, timesteps, runs = config
+        return wrappers.Simulation(model=copy.copy(model), timesteps=timesteps, runs=runs)
 
     def _run_stream(self, configs):
         simulations = [Engine._get_simulation_from_config(config) for config in configs]
+        # NOTE Hook allows mutation of RunArgs: when hooks are set, the initial state and parameters of each run are copied
+        # as the run is planned, so that each run is executed with the values set by the hooks called before it
+        snapshot = _snapshots() if any(getattr(self.experiment, hook) for hook in RUN_HOOKS) else (lambda value: value)
 
         for simulation_index, simulation in enumerate(simulations):
             simulation.index = simulation_index
@@ -162,72 +892,191 @@ class Engine:
             timesteps = simulation.timesteps
             runs = simulation.runs
             initial_state = simulation.model.initial_state
-            state_update_blocks = simulation.model.state_update_blocks
+            state_update_blocks = simulation.model.compile(
+                debug=self.debug,
+                deepcopy=self.deepcopy,
+                concurrent_policies=self.concurrent_policies,
+            )
             params = simulation.model.params
+            copy_strategies = simulation.model.copy_strategies
+            exclude = simulation.model._excluded_state_keys()
             param_sweep = core.generate_parameter_sweep(params)
 
             self.experiment._before_simulation(
                 simulation=simulation
             )
 
-            # NOTE Hook allows mutation of RunArgs
-            for run_index in range(0, runs):
-                if param_sweep:
-                    context = wrappers.Context(
-                        simulation_index,
-                        run_index,
-                        None,
-                        timesteps,
-                        initial_state,
-                        params
-                    )
-                    self.experiment._before_run(context=context)
-                    for subset_index, param_set in enumerate(param_sweep):
+            if (self.vectorize_runs and runs > 1) or (self.vectorize_subsets and len(param_sweep) > 1):
+                yield from self._vectorized_run_stream(
+                    simulation_index,
+                    timesteps,
+                    runs,
+                    initial_state,
+                    state_update_blocks,
+                    params,
+                    copy_strategies,
+                    exclude,
+                    param_sweep,
+                    snapshot,
+                )
+            else:
+                for run_index in range(0, runs):
+                    if param_sweep:
                         context = wrappers.Context(
                             simulation_index,
                             run_index,
-                            subset_index,
+                            None,
                             timesteps,
                             initial_state,
                             params
                         )
-                        self.experiment._before_subset(context=context)
+                        self.experiment._before_run(context=context)
+                        for subset_index, param_set in enumerate(param_sweep):
+                            context = wrappers.Context(
+                                simulation_index,
+                                run_index,
+                                subset_index,
+                                timesteps,
+                                initial_state,
+                                params
+                            )
+                            self.experiment._before_subset(context=context)
+                            yield wrappers.RunArgs(
+                                simulation_index,
+                                timesteps,
+                                run_index,
+                                subset_index,
+                                snapshot(initial_state),
+                                state_update_blocks,
+                                snapshot(param_set),
+                                self.deepcopy,
+                                self.drop_substeps,
+                                self.columnar,
+                                copy_strategies,
+                                1,
+                                1,
+                                self.save_every,
+                                self.reducers,
+                                exclude,
+                                self.history_window,
+                            )
+                            self.experiment._after_subset(context=context)
+                        self.experiment._before_run(context=context)
+                    else:
+                        context = wrappers.Context(
+                            simulation_index,
+                            run_index,
+                            0,
+                            timesteps,
+                            initial_state,
+                            params
+                        )
+                        self.experiment._before_run(context=context)
                         yield wrappers.RunArgs(
                             simulation_index,
                             timesteps,
                             run_index,
-                            subset_index,
-                            copy.deepcopy(initial_state),
+                            0,
+                            snapshot(initial_state),
                             state_update_blocks,
-                            copy.deepcopy(param_set),
+                            snapshot(params),
                             self.deepcopy,
                             self.drop_substeps,
+                            self.columnar,
+                            copy_strategies,
+                            1,
+                            1,
+                            self.save_every,
+                            self.reducers,
+                            exclude,
+                            self.history_window,
                         )
-                        self.experiment._after_subset(context=context)
-                    self.experiment._before_run(context=context)
-                else:
-                    context = wrappers.Context(
-                        simulation_index,
-                        run_index,
-                        0,
-                        timesteps,
-                        initial_state,
-                        params
-                    )
-                    self.experiment._before_run(context=context)
-                    yield wrappers.RunArgs(
-                        simulation_index,
-                        timesteps,
-                        run_index,
-                        0,
-                        copy.deepcopy(initial_state),
-                        state_update_blocks,
-                        copy.deepcopy(params),
-                        self.deepcopy,
-                        self.drop_substeps,
-                    )
-                    self.experiment._after_run(context=context)
+                        self.experiment._after_run(context=context)
 
             self.experiment._after_simulation(
                 simulation=simulation
             )
+
+    def _vectorized_run_stream(
+        self,
+        simulation_index,
+        timesteps,
+        runs,
+        initial_state,
+        state_update_blocks,
+        params,
+        copy_strategies,
+        exclude,
+        param_sweep,
+        snapshot,
+    ):
+        vectorized_runs = runs if self.vectorize_runs else 1
+        subsets = len(param_sweep) if self.vectorize_subsets and len(param_sweep) > 1 else 1
+        if subsets > 1:
+            # All subsets are executed as a single vectorized run, with swept parameters as arrays along a `subset` axis
+            vectorized_params = core.vectorize_parameter_sweep(params, param_sweep, vectorized_runs)
+            tasks = [(run_index, 0, vectorized_params) for run_index in range(0, runs, vectorized_runs)]
+        else:
+            # All Monte Carlo runs of each subset are executed as a single vectorized run
+            tasks = [(0, subset_index, param_set) for subset_index, param_set in enumerate(param_sweep or [params])]
+
+        for run_index in range(0, runs):
+            context = wrappers.Context(
+                simulation_index,
+                run_index,
+                None,
+                timesteps,
+                initial_state,
+                params
+            )
+            self.experiment._before_run(context=context)
+        for subset_index in range(0, len(param_sweep)):
+            context = wrappers.Context(
+                simulation_index,
+                None,
+                subset_index,
+                timesteps,
+                initial_state,
+                params
+            )
+            self.experiment._before_subset(context=context)
+        for run_index, subset_index, param_set in tasks:
+            yield wrappers.RunArgs(
+                simulation_index,
+                timesteps,
+                run_index,
+                subset_index,
+                snapshot(initial_state),
+                state_update_blocks,
+                snapshot(param_set),
+                self.deepcopy,
+                self.drop_substeps,
+                self.columnar,
+                copy_strategies,
+                vectorized_runs,
+                subsets,
+                self.save_every,
+                self.reducers,
+                exclude,
+                self.history_window,
+            )
+        for subset_index in range(0, len(param_sweep)):
+            context = wrappers.Context(
+                simulation_index,
+                None,
+                subset_index,
+                timesteps,
+                initial_state,
+                params
+            )
+            self.experiment._after_subset(context=context)
+        for run_index in range(0, runs):
+            context = wrappers.Context(
+                simulation_index,
+                run_index,
+                None,
+                timesteps,
+                initial_state,
+                params
+            )
+            self.experiment._after_run(context=context)
@@ -0,0 +1,145 @@
+from collections.abc import Sequence
+
+from radcad.columnar import _dtype_for
+
+import numpy as np
+
+
+def _layout(value):
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return value.dtype, value.shape
+    return _dtype_for(value), ()
+
+
+def _readonly(value):
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+    return value
+
+
+class _HistoryBuffer:
+    """
+    The values of one state variable in the state history, stored contiguously in a NumPy array,
+    with the most recent `maxlen` values retained if `maxlen` is not None.
+    """
+
+    def __init__(self, maxlen=None):
+        self._maxlen = maxlen
+        self._data = None
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def values(self):
+        if self._data is None:
+            return np.empty(0, dtype=object)
+        return self._data[self._start : self._end]
+
+    def append(self, value):
+        dtype, shape = _layout(value)
+        if self._data is None:
+            capacity = 2 * self._maxlen if self._maxlen else 64
+            self._data = np.empty((max(capacity, 1),) + shape, dtype=dtype)
+        elif dtype != self._data.dtype or shape != self._data.shape[1:]:
+            self._promote(dtype, shape)
+        if self._end == len(self._data):
+            self._reserve()
+        self._data[self._end] = value
+        self._end += 1
+        if self._maxlen is not None and len(self) > self._maxlen:
+            self._start += 1
+
+    def _promote(self, dtype, shape):
+        if shape == self._data.shape[1:] and dtype != object and self._data.dtype != object:
+            promoted = np.promote_types(self._data.dtype, dtype)
+            if promoted != self._data.dtype:
+                self._data = self._data.astype(promoted)
+        elif self._data.dtype != object or self._data.ndim > 1:
+            # Values of varying shapes or types fall back to an object array
+            data = np.empty(len(self._data), dtype=object)
+            for index in range(self._start, self._end):
+                data[index] = self._data[index]
+            self._data = data
+
+    def _reserve(self):
+        # The retained values are moved to a new array, rather than to the front of the buffer,
+        # as values returned by `StateHistory.get()` and `series()` are views of the buffer that may be stored in the state.
+        # A bounded buffer has twice the capacity it retains, so that moving the retained values is amortized O(1)
+        size = len(self)
+        capacity = len(self._data) if size * 2 <= len(self._data) else len(self._data) * 2
+        data = np.empty((capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+        data[:size] = self._data[self._start : self._end]
+        self._data = data
+        self._start, self._end = 0, size
+
+
+class StateHistory(Sequence):
+    """
+    The state history passed to policy and state update functions, a sequence of the substeps of each timestep
+    (e.g. `state_history[-1][-1]` is the final state of the previous timestep).
+
+    `get(key, lag)` looks up the final state of a previous timestep, and `series(key, last)` the final states of the last timesteps
+    in a NumPy buffer per state variable, created the first time the state variable is accessed, instead of scanning the substeps.
+    """
+
+    def __init__(self, timesteps):
+        self.timesteps = timesteps
+        self._maxlen = getattr(timesteps, "maxlen", None)
+        self._buffers = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) and not isinstance(self.timesteps, list):
+            return list(self.timesteps)[index]
+        return self.timesteps[index]
+
+    def __len__(self):
+        return len(self.timesteps)
+
+    def __iter__(self):
+        return iter(self.timesteps)
+
+    def __repr__(self):
+        return f"StateHistory({self.timesteps!r})"
+
+    def get(self, key, lag=1):
+        """
+        Get the value of the state variable `key` at the end of the timestep `lag` timesteps ago,
+        equivalent to `state_history[-lag][-1][key]`.
+        """
+        if not 1 <= lag <= len(self):
+            raise IndexError(f"State history lag {lag} out of range for history of {len(self)} timesteps")
+        return self.timesteps[-lag][-1][key]
+
+    def series(self, key, last=None):
+        """
+        Get the values of the state variable `key` at the end of the `last` timesteps (or all timesteps), oldest first,
+        as a read-only NumPy array.
+
+        The values are copied into the array as each timestep is appended, so unlike `state_history[-lag][-1][key]`,
+        Python numbers are returned as NumPy scalars (e.g. `np.int64`), values are promoted to a common dtype
+        (e.g. earlier ints are returned as floats once a float is appended), and arrays mutated in place
+        after their timestep are returned as they were at the end of the timestep.
+        """
+        size = len(self) if last is None else min(last, len(self))
+        if size <= 0:
+            return np.empty(0, dtype=object)
+        buffer = self._buffer(key)
+        return _readonly(buffer.values[len(buffer) - size :])
+
+    def append(self, substeps):
+        self.timesteps.append(substeps)
+        for (key, buffer) in self._buffers.items():
+            buffer.append(substeps[-1][key])
+
+    def _buffer(self, key):
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = _HistoryBuffer(self._maxlen)
+            for substeps in self.timesteps:
+                buffer.append(substeps[-1][key])
+            self._buffers[key] = buffer
+        return buffer
@@ -0,0 +1,187 @@
+from radcad.columnar import ColumnarRun, RUN_METADATA
+
+import os
+import queue
+import threading
+
+
+class ResultSink:
+    """
+    A destination for the results of each completed run, written from a background writer thread
+    so that simulation and disk I/O overlap.
+
+    At most `max_pending` runs are queued for writing; once the queue is full, the engine waits for the writer,
+    so memory stays bounded by the runs in flight. Subclasses implement `_open()`, `_write()`, and `_close()`.
+    """
+
+    def __init__(self, max_pending=8):
+        self.max_pending = max_pending
+        self._queue = None
+        self._thread = None
+        self._error = None
+
+    def open(self, experiment=None):
+        self._error = None
+        self._open(experiment)
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._thread = threading.Thread(target=self._writer, name=f"{type(self).__name__}Writer", daemon=True)
+        self._thread.start()
+
+    def write(self, context, result):
+        self._raise_error()
+        self._queue.put((context, result))
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._close()
+        self._raise_error()
+
+    def _writer(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                try:
+                    self._write(*item)
+                except Exception as error:
+                    self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _open(self, experiment):
+        pass
+
+    def _write(self, context, result):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class ParquetSink(ResultSink):
+    """
+    Write the results of each run to a Parquet file, in a Hive-style dataset partitioned by `partition_by`
+    (e.g. `path/simulation=0/subset=1/run=2/part-0-1-2.parquet`), which can be read using `pd.read_parquet(path)`.
+    """
+
+    def __init__(self, path, partition_by=RUN_METADATA, compression="snappy", **kwargs):
+        super().__init__(**kwargs)
+        try:
+            import pyarrow
+        except ImportError:
+            raise Exception("Optional dependency pyarrow not installed, required for ParquetSink")
+        self.path = path
+        self.partition_by = tuple(partition_by)
+        self.compression = compression
+
+    def _open(self, experiment):
+        os.makedirs(self.path, exist_ok=True)
+
+    def _write(self, context, result):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if isinstance(result, ColumnarRun):
+            table = pa.table({key: result[key] for key in result.keys if key not in self.partition_by})
+        else:
+            # `pa.Table.from_pylist()` requires pyarrow 7
+            keys = [key for key in dict.fromkeys(key for record in result for key in record) if key not in self.partition_by]
+            table = pa.Table.from_pydict({key: [record.get(key) for record in result] for key in keys})
+        if not table.num_rows:
+            return
+
+        run = {
+            "simulation": context.simulation,
+            "subset": context.subset,
+            "run": context.run + 1,
+        }
+        directory = os.path.join(self.path, *(f"{key}={run[key]}" for key in self.partition_by))
+        os.makedirs(directory, exist_ok=True)
+        file_name = f"part-{run['simulation']}-{run['subset']}-{run['run']}.parquet"
+        pq.write_table(table, os.path.join(directory, file_name), compression=self.compression)
+
+
+class HDF5Sink(ResultSink):
+    """
+    Append the results of each run to a compressed, chunked HDF5 table (using Pandas and PyTables),
+    with `data_columns` indexed when the sink is closed, so that the results can be queried from disk
+    using `read(where=...)`, e.g. `sink.read(where="subset == 1 & timestep > 50")`.
+
+    The table `key` is replaced when the sink is opened. State variables must be numeric or strings;
+    use `min_itemsize` to reserve space for strings longer than those in the first run.
+    """
+
+    def __init__(
+        self,
+        path,
+        key="results",
+        data_columns=RUN_METADATA + ("timestep",),
+        complevel=5,
+        complib="blosc",
+        min_itemsize=None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.path = path
+        self.key = key
+        self.data_columns = list(data_columns)
+        self.complevel = complevel
+        self.complib = complib
+        self.min_itemsize = min_itemsize
+        self._store = None
+        self._rows = 0
+
+    def _open(self, experiment):
+        import pandas as pd
+
+        self._store = pd.HDFStore(self.path, mode="a", complevel=self.complevel, complib=self.complib)
+        if self.key in self._store:
+            self._store.remove(self.key)
+        self._rows = 0
+
+    def _write(self, context, result):
+        import pandas as pd
+
+        if isinstance(result, ColumnarRun):
+            df = pd.DataFrame({key: result[key] for key in result.keys}, columns=result.keys)
+        else:
+            df = pd.DataFrame(result)
+        if df.empty:
+            return
+
+        # Rows are indexed across runs, in the order they are written
+        df.index = pd.RangeIndex(self._rows, self._rows + len(df))
+        self._store.append(
+            self.key,
+            df,
+            format="table",
+            data_columns=self.data_columns,
+            min_itemsize=self.min_itemsize,
+            index=False,
+        )
+        self._rows += len(df)
+
+    def _close(self):
+        if self._store is None:
+            return
+        try:
+            if self._rows:
+                self._store.create_table_index(self.key, columns=self.data_columns, optlevel=9, kind="full")
+        finally:
+            self._store.close()
+            self._store = None
+
+    def read(self, where=None, columns=None):
+        """
+        Read the results from the HDF5 table, optionally selecting the rows matching the `where` query.
+        """
+        import pandas as pd
+
+        return pd.read_hdf(self.path, self.key, where=where, columns=columns)
@@ -0,0 +1,157 @@
+from collections.abc import MutableMapping
+from decimal import Decimal
+from fractions import Fraction
+import pickle
+
+import numpy as np
+
+
+class CopyOnWriteState(MutableMapping):
+    """
+    A state mapping that shares its entries with a base state, and only stores the keys that have been updated.
+
+    Copies share the updated entries too, until either the copy or the original is written to,
+    so the cost of copying scales with the number of updated state variables rather than the size of the state.
+    """
+
+    __slots__ = ("_base", "_updates", "_owned")
+
+    def __init__(self, base: dict, updates: dict = None):
+        self._base = base
+        self._updates = {} if updates is None else updates
+        self._owned = updates is None
+
+    def __getitem__(self, key):
+        updates = self._updates
+        if key in updates:
+            return updates[key]
+        return self._base[key]
+
+    def __setitem__(self, key, value):
+        if not self._owned:
+            self._updates = self._updates.copy()
+            self._owned = True
+        self._updates[key] = value
+
+    def __delitem__(self, key):
+        state = self.to_dict()
+        del state[key]
+        self._base, self._updates, self._owned = state, {}, True
+
+    def __contains__(self, key):
+        return key in self._updates or key in self._base
+
+    def __iter__(self):
+        updates = self._updates
+        yield from self._base
+        for key in updates:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return len(self._base) + sum(1 for key in self._updates if key not in self._base)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+    def get(self, key, default=None):
+        updates = self._updates
+        if key in updates:
+            return updates[key]
+        return self._base.get(key, default)
+
+    def update(self, other=(), **kwargs):
+        if not self._owned:
+            self._updates = self._updates.copy()
+            self._owned = True
+        self._updates.update(other, **kwargs)
+
+    def copy(self):
+        self._owned = False
+        return CopyOnWriteState(self._base, self._updates)
+
+    def to_dict(self) -> dict:
+        state = dict(self._base)
+        state.update(self._updates)
+        return state
+
+
+def materialize(state):
+    return state.to_dict() if isinstance(state, CopyOnWriteState) else state
+
+
+def _no_copy(value):
+    return value
+
+
+def _pickle_copy(value):
+    return pickle.loads(pickle.dumps(value, -1))
+
+
+def _copy_tuple(value):
+    if all(type(item) in _immutable_types for item in value):
+        return value
+    return _pickle_copy(value)
+
+
+def _copy_ndarray(value):
+    return value.copy() if value.dtype != object else _pickle_copy(value)
+
+
+_immutable_types = {type(None), bool, int, float, complex, str, bytes, range, frozenset, Decimal, Fraction}
+
+_copy_strategies = {
+    **{_type: _no_copy for _type in _immutable_types},
+    tuple: _copy_tuple,
+    np.generic: _no_copy,
+    np.ndarray: _copy_ndarray,
+}
+
+_resolved_copy_strategies = {}
+
+
+def register_copy_strategy(_type, strategy):
+    """
+    Register the function used to copy state variables of the given type (and its subclasses),
+    or `None` if values of the type are immutable and don't need to be copied.
+    """
+    _copy_strategies[_type] = strategy if strategy is not None else _no_copy
+    _resolved_copy_strategies.clear()
+
+
+def _resolve_copy_strategy(_type):
+    if _type in _copy_strategies:
+        return _copy_strategies[_type]
+    hook = getattr(_type, "__radcad_copy__", None)
+    if hook is not None:
+        return hook
+    for base in _type.__mro__[1:]:
+        if base in _copy_strategies:
+            return _copy_strategies[base]
+    return _pickle_copy
+
+
+def copy_value(value):
+    _type = type(value)
+    strategy = _resolved_copy_strategies.get(_type)
+    if strategy is None:
+        strategy = _resolved_copy_strategies[_type] = _resolve_copy_strategy(_type)
+    return strategy(value)
+
+
+def copy_state_variable(copy_strategies: dict, key, value):
+    if key in copy_strategies:
+        strategy = copy_strategies[key]
+        return strategy(value) if strategy is not None else value
+    return copy_value(value)
+
+
+def copy_state(copy_strategies: dict, state) -> dict:
+    """
+    Copy the state into a plain dict, copying each state variable using its copy strategy, unless it is immutable.
+    """
+    state = state.to_dict() if isinstance(state, CopyOnWriteState) else state.copy()
+    for (key, value) in state.items():
+        if type(value) not in _immutable_types or key in copy_strategies:
+            state[key] = copy_state_variable(copy_strategies, key, value)
+    return state
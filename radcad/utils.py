@@ -13,3 +13,29 @@ def flatten(nested_list):
 def extract_exceptions(results_with_exceptions):
     results, exceptions = zip(*results_with_exceptions)
     return (list(flatten(flatten(list(results)))), list(exceptions))
+
+
+def reorder(indexed_items):
+    """
+    Reorder an iterable of `(index, item)` pairs by index, buffering items that arrive before their predecessors.
+    """
+    buffer = {}
+    next_index = 0
+    for (index, item) in indexed_items:
+        buffer[index] = item
+        while next_index in buffer:
+            yield next_index, buffer.pop(next_index)
+            next_index += 1
+
+
+async def reorder_async(indexed_items):
+    """
+    Reorder an async iterable of `(index, item)` pairs by index, like `reorder()`.
+    """
+    buffer = {}
+    next_index = 0
+    async for (index, item) in indexed_items:
+        buffer[index] = item
+        while next_index in buffer:
+            yield next_index, buffer.pop(next_index)
+            next_index += 1
@@ -1,15 +1,43 @@
 from radcad.engine import Engine
+import radcad.core as core
 from collections import namedtuple
 
 
-RunArgs = namedtuple("RunArgs", "simulation timesteps run subset initial_state state_update_blocks parameters deepcopy drop_substeps")
+RunArgs = namedtuple("RunArgs", "simulation timesteps run subset initial_state state_update_blocks parameters deepcopy drop_substeps columnar copy_strategies runs subsets save_every reducers exclude history_window")
 Context = namedtuple("Context", "simulation run subset timesteps initial_state parameters")
 
 class Model:
-    def __init__(self, initial_state={}, state_update_blocks=[], params={}):
+    def __init__(self, initial_state={}, state_update_blocks=[], params={}, copy_strategies={}, record=None, exclude=None):
         self.initial_state = initial_state
         self.state_update_blocks = state_update_blocks
         self.params = params
+        # State key -> function used to copy the state variable when `Engine.deepcopy` is enabled, or None to not copy it
+        self.copy_strategies = copy_strategies
+        # State keys recorded in the results, or excluded from the results, while still available to the state update blocks
+        self.record = record
+        self.exclude = exclude
+
+        if record is not None and exclude is not None:
+            raise Exception("Model record and exclude options are mutually exclusive")
+
+    def compile(self, debug=False, deepcopy=True, concurrent_policies=False):
+        """
+        Compile and validate the state update blocks into a `core.ExecutionPlan`.
+        In debug mode, the state keys returned by state update functions are validated on every call.
+        Unless `deepcopy` is enabled, the signals of a single policy are not copied.
+        With `concurrent_policies`, the policies of each block are evaluated concurrently, unless the block sets `concurrent` to False.
+        """
+        return core.compile_state_update_blocks(
+            self.initial_state, self.state_update_blocks, debug, deepcopy, concurrent_policies
+        )
+
+    def _excluded_state_keys(self):
+        keys = set(self.record if self.record is not None else self.exclude or [])
+        if not keys.issubset(self.initial_state):
+            raise KeyError(f"Invalid state key in Model record or exclude option: {keys - set(self.initial_state)}")
+        if self.record is not None:
+            return frozenset(self.initial_state).difference(keys)
+        return frozenset(keys)
 
 
 class Simulation:
@@ -61,6 +89,27 @@ class Experiment:
     def run(self):
         return self.engine._run(experiment=self)
 
+    def run_iter(self, ordered=False):
+        """
+        Run the experiment, yielding the `(context, result)` of each run as soon as it completes.
+        Set `ordered` to yield the runs in the same order as `Experiment.run()`.
+        """
+        return self.engine._run_iter(experiment=self, ordered=ordered)
+
+    async def run_async(self):
+        """
+        Run the experiment without blocking the event loop, returning the same results as `Experiment.run()`.
+        Cancelling the awaiting task cancels the outstanding runs.
+        """
+        return await self.engine._run_async(experiment=self)
+
+    def run_iter_async(self, ordered=False):
+        """
+        Run the experiment, asynchronously yielding the `(context, result)` of each run as soon as it completes.
+        Set `ordered` to yield the runs in the same order as `Experiment.run()`.
+        """
+        return self.engine._run_iter_async(experiment=self, ordered=ordered)
+
     def add_simulations(self, simulations):
         if not isinstance(simulations, list):
             simulations = [simulations]
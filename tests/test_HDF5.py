@@ -1,5 +1,6 @@
 from radcad import Model, Simulation, Experiment
-from radcad.engine import Engine
+from radcad.engine import Engine, Backend
+from radcad.sinks import HDF5Sink
 from tests.test_cases import basic
 
 import pandas as pd
@@ -47,3 +48,22 @@ def test_to_HDF5():
     assert len(raw_result) > 0
     assert raw_result == experiment.results
     assert simulation.run() == raw_result
+
+def test_HDF5_sink(tmp_path):
+    model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+    simulation = Simulation(model=model, timesteps=basic.TIMESTEPS, runs=basic.RUNS)
+    experiment = Experiment(simulations=[simulation], engine=Engine(backend=Backend.SINGLE_PROCESS))
+    df = pd.DataFrame(experiment.run())
+
+    sink = HDF5Sink(str(tmp_path / 'experiment_results.hdf5'))
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, sink=sink)
+    assert len(experiment.run()) == 0
+    assert sink.read().equals(df)
+
+    # Writing again replaces the results
+    experiment.run()
+    assert sink.read().equals(df)
+
+    query = "subset == 1 & timestep > 50"
+    assert sink.read(where=query).equals(df.query("subset == 1 and timestep > 50"))
+    assert list(sink.read(where="run == 1", columns=['a']).columns) == ['a']
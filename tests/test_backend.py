@@ -61,3 +61,20 @@ def test_backend_single_process():
     assert df_multiprocessing.equals(df_ray)
     assert df_multiprocessing.equals(df_pathos)
     assert df_multiprocessing.equals(df_single_process)
+
+def test_ray_max_pending_tasks():
+    model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+    simulation = Simulation(model=model, timesteps=10, runs=basic.RUNS)
+    experiment = Experiment(simulation)
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+    df_single_process = pd.DataFrame(experiment.run())
+
+    experiment.engine = Engine(backend=Backend.RAY, max_pending_tasks=1)
+    df_ray = pd.DataFrame(experiment.run())
+
+    assert df_single_process.equals(df_ray)
+
+    experiment.engine = Engine(backend=Backend.RAY, max_pending_tasks=0)
+    with pytest.raises(Exception):
+        experiment.run()
@@ -0,0 +1,73 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+import radcad.engine
+from tests.test_cases import basic
+
+import numpy as np
+import pytest
+
+
+def update_a(params, substep, state_history, previous_state, policy_input):
+    return 'a', previous_state['a'] + params['table'][previous_state['timestep']]
+
+model = Model(
+    initial_state={**basic.states, 'array': np.zeros(1000)},
+    state_update_blocks=[{'policies': {}, 'variables': {'a': update_a}}],
+    params={'table': [np.arange(100)], 'b': [1, 2]},
+)
+simulation = Simulation(model=model, timesteps=10, runs=3)
+
+
+def test_share_run_args():
+    experiment = Experiment(simulation)
+    experiment.engine._prepare(experiment)
+    run_args = list(experiment.engine._run_stream([(model, 10, 3)]))
+    components, shared_run_args = Engine._share_run_args(run_args)
+
+    # One state update blocks, initial state, copy strategies and reducers, and one parameter set per subset
+    assert len(run_args) == 6
+    assert len(components) == 6
+    assert all(isinstance(args.parameters, int) for args in shared_run_args)
+
+    resolved = [Engine._resolve_run_args(args, components) for args in shared_run_args]
+    assert resolved[0].initial_state is not resolved[2].initial_state
+    assert resolved[0].state_update_blocks is resolved[2].state_update_blocks
+    assert resolved[0].parameters['b'] == resolved[2].parameters['b'] == 1
+
+
+@pytest.mark.parametrize("backend", [Backend.PATHOS, Backend.MULTIPROCESSING, Backend.RAY])
+def test_broadcast(backend):
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    results = experiment.run()
+
+    experiment.engine = Engine(backend=backend, processes=2)
+    assert [result['a'] for result in experiment.run()] == [result['a'] for result in results]
+
+
+def test_share_run_args_with_hooks():
+    def set_initial_state(context=None):
+        if context.run == 2:
+            context.initial_state['a'] = 100
+
+    hooked_model = Model(initial_state=dict(model.initial_state), state_update_blocks=model.state_update_blocks, params=model.params)
+    experiment = Experiment(Simulation(model=hooked_model, timesteps=10, runs=3), before_run=set_initial_state)
+    experiment.engine._prepare(experiment)
+    run_args = list(experiment.engine._run_stream([(hooked_model, 10, 3)]))
+    components, _shared_run_args = Engine._share_run_args(run_args)
+
+    # The values copied as each run is planned are shared by the runs with the same contents
+    assert len(components) == 7
+    assert run_args[0].initial_state is run_args[3].initial_state
+    assert run_args[4].initial_state['a'] == 100
+    assert run_args[0].initial_state['a'] == basic.states['a']
+
+
+def test_broadcast_without_shared_memory(monkeypatch):
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    results = experiment.run()
+
+    # Components that don't fit in shared memory are sent with each task
+    monkeypatch.setattr(radcad.engine, "_shared_memory_free", lambda: 0)
+    assert Engine._publish([model.params]) == (None, [model.params])
+    experiment.engine = Engine(backend=Backend.PATHOS, processes=2)
+    assert [result['a'] for result in experiment.run()] == [result['a'] for result in results]
@@ -0,0 +1,163 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from radcad.cache import ResultCache, stable_hash, UnhashableValueError
+from tests.test_cases import basic
+
+import numpy as np
+import pytest
+import types
+
+
+TIMESTEPS = 10
+RUNS = 3
+
+def update_counted(params, substep, state_history, previous_state, policy_input):
+    # The executed runs are logged to a file, also from worker processes
+    if 'calls' in params:
+        with open(params['calls'], 'a') as file:
+            file.write(f"{previous_state['run']}\n")
+    return 'a', previous_state['a'] + params['step']
+
+def update_doubled(params, substep, state_history, previous_state, policy_input):
+    return 'a', previous_state['a'] + 2 * params['step']
+
+
+def model(params, update=update_counted):
+    return Model(
+        initial_state={'a': 0},
+        state_update_blocks=[{'policies': {}, 'variables': {'a': update}}],
+        params=params,
+    )
+
+
+def test_stable_hash():
+    assert stable_hash({'a': 1, 'b': [1, 2]}) == stable_hash({'b': [1, 2], 'a': 1})
+    assert stable_hash({'a': 1}) != stable_hash({'a': 2})
+    assert stable_hash(frozenset(['a', 'b'])) == stable_hash(frozenset(['b', 'a']))
+    assert stable_hash(np.arange(3)) == stable_hash(np.arange(3))
+    assert stable_hash(np.arange(3)) != stable_hash(np.arange(3.0))
+    assert stable_hash(update_counted) == stable_hash(update_counted)
+    assert stable_hash(update_counted) != stable_hash(update_doubled)
+
+
+helpers = types.ModuleType("helpers")
+helpers.step = lambda value: value + 1
+table = {'step': 1}
+
+def update_module_attribute(params, substep, state_history, previous_state, policy_input):
+    return 'a', helpers.step(previous_state['a'])
+
+def update_table(params, substep, state_history, previous_state, policy_input):
+    return 'a', sum(table[key] for key in ['step'])
+
+
+def test_stable_hash_globals():
+    # Module attributes referenced by a function are hashed
+    update_hash = stable_hash(update_module_attribute)
+    helpers.step = lambda value: value + 2
+    assert stable_hash(update_module_attribute) != update_hash
+
+    # Global tables referenced by a function, including from nested code, are hashed
+    update_hash = stable_hash(update_table)
+    table['step'] = 2
+    assert stable_hash(update_table) != update_hash
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS])
+def test_cache(tmp_path, backend):
+    cache = ResultCache(str(tmp_path / "cache"))
+    calls = tmp_path / "calls.log"
+    experiment = Experiment(
+        Simulation(model=model({'step': [1, 2], 'calls': [str(calls)]}), timesteps=TIMESTEPS, runs=RUNS),
+        engine=Engine(backend=backend, cache=cache),
+    )
+    results = experiment.run()
+    assert cache.stats()['hits'] == 0
+    assert cache.stats()['misses'] == RUNS * 2
+
+    calls.unlink()
+    assert experiment.run() == results
+    assert not calls.exists()
+    assert cache.hits == RUNS * 2
+
+    # Extending the parameter sweep only executes the new subset
+    experiment.simulations[0].model.params = {'step': [1, 2, 3], 'calls': [str(calls)]}
+    results = experiment.run()
+    assert cache.hits == RUNS * 4
+    assert cache.misses == RUNS * 3
+    assert [record['a'] for record in results if record['subset'] == 2][-1] == 3 * TIMESTEPS
+
+    # The results are not reused if the model's code changes
+    experiment.simulations[0].model.state_update_blocks[0]['variables']['a'] = update_doubled
+    assert experiment.run() != results
+
+
+def test_cache_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    experiment = Experiment(
+        Simulation(model=model({'step': [1]}), timesteps=TIMESTEPS, runs=RUNS),
+        engine=Engine(backend=Backend.SINGLE_PROCESS, cache=cache),
+    )
+    experiment.run()
+    entry_size = cache.size() // RUNS
+
+    cache.max_size = entry_size * 2
+    cache.put("key", [])
+    assert cache.size() <= cache.max_size
+    assert cache.get("key") == []
+
+    # The size of the cache is tracked as results are put
+    assert cache._size == cache.size()
+
+    cache.clear()
+    assert cache.size() == 0
+
+
+def test_stable_hash_unpicklable():
+    class Local:
+        def __repr__(self):
+            return "Local()"
+
+    # Values that can't be pickled aren't hashed by their `repr()`, which may be the same for different values
+    with pytest.raises(UnhashableValueError):
+        stable_hash(Local())
+
+
+def test_cache_uncacheable(tmp_path):
+    class Local:
+        pass
+
+    def update_function(params, substep, state_history, previous_state, policy_input):
+        return 'f', lambda value: value + previous_state['a']
+
+    cache = ResultCache(str(tmp_path))
+    uncacheable_model = Model(
+        initial_state={'a': 0, 'f': None},
+        state_update_blocks=[
+            {'policies': {}, 'variables': {'a': update_counted}},
+            {'policies': {}, 'variables': {'f': update_function}},
+        ],
+        params={'step': [1], 'local': [Local()]},
+    )
+    simulations = [
+        # Parameters that can't be hashed
+        Simulation(model=uncacheable_model, timesteps=TIMESTEPS),
+        # Results that can't be pickled
+        Simulation(
+            model=Model(
+                initial_state={'a': 0, 'f': None},
+                state_update_blocks=[{'policies': {}, 'variables': {'f': update_function}}],
+                params={},
+            ),
+            timesteps=TIMESTEPS,
+        ),
+    ]
+    # Without deepcopy, so that the unpicklable state isn't copied
+    experiment = Experiment(simulations, engine=Engine(backend=Backend.SINGLE_PROCESS, cache=cache, deepcopy=False))
+
+    # The runs are executed without the cache
+    for _ in range(2):
+        results = experiment.run()
+        assert [record['a'] for record in results if record['simulation'] == 0][-1] == TIMESTEPS
+    assert cache.hits == 0
+    assert cache.size() == 0
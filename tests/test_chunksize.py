@@ -0,0 +1,41 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from tests.test_cases import basic
+
+import pytest
+
+
+TIMESTEPS = 10
+RUNS = 5
+
+model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS, Backend.MULTIPROCESSING])
+@pytest.mark.parametrize("chunksize", [3, "auto"])
+def test_chunksize(backend, chunksize):
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    results = experiment.run()
+
+    experiment.engine = Engine(backend=backend, chunksize=chunksize, processes=2)
+    assert experiment.run() == results
+    assert [(exception['run'], exception['subset']) for exception in experiment.exceptions] == [
+        (run, subset) for run in range(RUNS) for subset in range(2)
+    ]
+    assert sorted((context.run, context.subset) for context, _result in experiment.run_iter()) == [
+        (run, subset) for run in range(RUNS) for subset in range(2)
+    ]
+
+
+def test_auto_chunksize():
+    engine = Engine(chunksize="auto", processes=4)
+    assert engine._get_chunksize(10_000) == 625
+    assert engine._get_chunksize(17) == 2
+    assert engine._get_chunksize(3) == 1
+
+
+def test_invalid_chunksize():
+    experiment = Experiment(simulation, engine=Engine(chunksize=0))
+    with pytest.raises(Exception):
+        experiment.run()
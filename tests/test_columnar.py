@@ -0,0 +1,78 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from radcad.columnar import Column, ColumnarRun, ColumnarResults
+from tests.test_cases import basic
+
+import numpy as np
+import pandas as pd
+
+
+def test_column_promotion():
+    column = Column(capacity=1)
+    column.append(1)
+    assert column.dtype == np.int64
+    column.append(2.5)
+    assert column.dtype == np.float64
+    column.append([1])
+    assert column.dtype == object
+    assert list(column.values[:2]) == [1.0, 2.5]
+    assert column.values[2] == [1]
+    assert len(column) == 3
+
+
+def test_columnar_run():
+    records = [
+        {'a': 1.0, 'b': [0], 'simulation': 0, 'subset': 1, 'run': 2, 'substep': 0, 'timestep': 0},
+        {'a': 2.0, 'b': [1], 'simulation': 0, 'subset': 1, 'run': 2, 'substep': 1, 'timestep': 1},
+    ]
+    run = ColumnarRun.from_records(records)
+    assert (run.simulation, run.subset, run.run) == (0, 1, 2)
+    assert 'run' not in run.columns
+    assert run['a'].dtype == np.float64
+    assert list(run['run']) == [2, 2]
+    assert run.to_records() == records
+
+
+def test_columnar_results():
+    states = basic.states
+    state_update_blocks = basic.state_update_blocks
+    params = basic.params
+    TIMESTEPS = 10
+    RUNS = 3
+
+    model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=params)
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation)
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+    df_records = pd.DataFrame(experiment.run())
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, columnar=True)
+    results = experiment.run()
+
+    assert isinstance(results, ColumnarResults)
+    assert len(results) == len(df_records)
+    assert results.columns == list(df_records.columns)
+    assert results.to_dataframe().equals(df_records)
+    assert pd.DataFrame(results.to_records()).equals(df_records)
+
+
+def test_columnar_results_different_keys():
+    states = basic.states
+    state_update_blocks = basic.state_update_blocks
+    params = basic.params
+
+    model_a = Model(initial_state=states, state_update_blocks=state_update_blocks, params=params)
+    model_b = Model(initial_state={**states, 'c': 1}, state_update_blocks=state_update_blocks, params=params)
+    simulations = [Simulation(model=model_a, timesteps=5), Simulation(model=model_b, timesteps=5)]
+    experiment = Experiment(simulations)
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+    df_records = pd.DataFrame(experiment.run())
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, columnar=True)
+    results = experiment.run()
+
+    assert set(results.columns) == set(df_records.columns)
+    df_columnar = results.to_dataframe()[list(df_records.columns)]
+    pd.testing.assert_frame_equal(df_columnar, df_records, check_dtype=False)
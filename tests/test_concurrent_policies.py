@@ -0,0 +1,63 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+
+import time
+import pytest
+
+
+def sleeping_policy(index):
+    def policy(params, substep, state_history, previous_state):
+        time.sleep(0.02 * (4 - index))
+        return {'order': [index], 'total': index}
+    return policy
+
+def update_order(params, substep, state_history, previous_state, policy_input):
+    return 'order', policy_input['order']
+
+def update_total(params, substep, state_history, previous_state, policy_input):
+    return 'total', previous_state['total'] + policy_input['total']
+
+def state_update_blocks(**kwargs):
+    return [
+        {
+            'policies': {f'p_{index}': sleeping_policy(index) for index in range(4)},
+            'variables': {
+                'order': update_order,
+                'total': update_total,
+            },
+            **kwargs,
+        }
+    ]
+
+TIMESTEPS = 5
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS])
+def test_concurrent_policies(backend):
+    model = Model(initial_state={'order': [], 'total': 0}, state_update_blocks=state_update_blocks(), params={})
+    experiment = Experiment(Simulation(model=model, timesteps=TIMESTEPS, runs=2))
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+    start = time.time()
+    results = experiment.run()
+    sequential_time = time.time() - start
+
+    experiment.engine = Engine(backend=backend, concurrent_policies=True)
+    start = time.time()
+    assert experiment.run() == results
+    if backend == Backend.SINGLE_PROCESS:
+        assert time.time() - start < sequential_time * 0.75
+
+    # Signals are aggregated in the order of the policies, not the order they complete
+    assert results[-1]['order'] == [0, 1, 2, 3]
+    assert results[-1]['total'] == 6 * TIMESTEPS
+
+
+def test_concurrent_policies_block():
+    model = Model(
+        initial_state={'order': [], 'total': 0},
+        state_update_blocks=state_update_blocks(concurrent=True),
+        params={},
+    )
+    experiment = Experiment(Simulation(model=model, timesteps=TIMESTEPS), engine=Engine(backend=Backend.SINGLE_PROCESS))
+    assert experiment.run()[-1]['order'] == [0, 1, 2, 3]
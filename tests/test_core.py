@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import radcad.core as core
@@ -61,3 +62,59 @@ def test_run():
     experiment = Experiment(simulation)
 
     assert flatten(core.run([simulation])) == experiment.run()
+
+def test_reduce_signals_zero():
+    psu = {
+        'policies': {
+            '1': lambda params, substep, state_history, previous_state: {'signal_a': 1.0, 'signal_b': np.zeros(2)},
+            '2': lambda params, substep, state_history, previous_state: {'signal_a': -1.0, 'signal_b': np.ones(2)},
+            '3': lambda params, substep, state_history, previous_state: {'signal_a': 0.0, 'signal_b': np.ones(2)},
+        },
+        'variables': {}
+    }
+
+    signals = reduce_signals({}, 1, [], {}, psu)
+    assert signals['signal_a'] == 0.0
+    assert list(signals['signal_b']) == [2.0, 2.0]
+
+@pytest.mark.parametrize("aggregation,expected", [
+    ('sum', [6.0, 6.0]),
+    ('product', [6.0, 6.0]),
+    ('max', [3.0, 3.0]),
+    ('min', [1.0, 1.0]),
+    ('concat', [1.0, 1.0, 2.0, 2.0, 3.0, 3.0]),
+    (np.add, [6.0, 6.0]),
+    (lambda a, b: a - b, [-4.0, -4.0]),
+])
+def test_reduce_signals_aggregation(aggregation, expected):
+    signals = [np.full(2, 1.0), np.full(2, 2.0), np.full(2, 3.0)]
+    psu = {
+        'policies': {
+            str(index): (lambda signal: lambda params, substep, state_history, previous_state: {'signal': signal, 'scalar': 2})(signal)
+            for index, signal in enumerate(signals)
+        },
+        'variables': {},
+        'aggregation': aggregation,
+    }
+
+    result = reduce_signals({}, 1, [], {}, psu)
+    assert list(result['signal']) == expected
+    # Policy signals are not mutated by the aggregation
+    assert [list(signal) for signal in signals] == [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]
+
+def test_reduce_signals_invalid_aggregation():
+    policy = lambda params, substep, state_history, previous_state: {'signal': 1}
+    psu = {'policies': {'1': policy, '2': policy}, 'variables': {}, 'aggregation': 'mean'}
+    with pytest.raises(Exception, match="Invalid policy aggregation mean"):
+        reduce_signals({}, 1, [], {}, psu)
+
+def test_single_policy_copy():
+    signals = {'signal': [1.0]}
+    psu = {'policies': {'1': lambda params, substep, state_history, previous_state: signals}, 'variables': {}}
+
+    # Signals of a single policy are only copied when deepcopy is enabled
+    [(policies, _variables, reduce_policies)] = core.compile_state_update_blocks({}, [psu], deepcopy=True)
+    assert reduce_policies({}, 0, [], {}, policies) == signals
+    assert reduce_policies({}, 0, [], {}, policies) is not signals
+    [(policies, _variables, reduce_policies)] = core.compile_state_update_blocks({}, [psu], deepcopy=False)
+    assert reduce_policies({}, 0, [], {}, policies) is signals
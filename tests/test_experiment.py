@@ -1,6 +1,9 @@
 from radcad import Model, Simulation, Experiment, Engine
+from radcad.engine import Backend, CostScheduler
 from tests.test_cases import basic
 
+import pytest
+
 
 states = basic.states
 state_update_blocks = basic.state_update_blocks
@@ -56,3 +59,49 @@ def test_hooks(capfd):
     # out, err = capfd.readouterr()
 
     assert True
+
+
+def test_hook_order_single_process():
+    events = []
+
+    def update_a(params, substep, state_history, previous_state, policy_input):
+        if previous_state['timestep'] == 0:
+            events.append(('update', previous_state['run'] - 1))
+        return 'a', previous_state['a']
+
+    model = Model(initial_state={'a': 0}, state_update_blocks=[{'policies': {}, 'variables': {'a': update_a}}], params={})
+    experiment = Experiment(Simulation(model=model, timesteps=2, runs=2))
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+    experiment.before_run = lambda context=None: events.append(('before_run', context.run))
+    experiment.after_run = lambda context=None: events.append(('after_run', context.run))
+    experiment.run()
+
+    # The hooks of each run are interleaved with the execution of the runs
+    assert events == [
+        ('before_run', 0), ('update', 0), ('after_run', 0),
+        ('before_run', 1), ('update', 1), ('after_run', 1),
+    ]
+
+
+@pytest.mark.parametrize("hook", ["before_run", "before_subset"])
+@pytest.mark.parametrize("engine_options", [
+    {'backend': Backend.SINGLE_PROCESS},
+    {'backend': Backend.SINGLE_PROCESS, 'scheduler': CostScheduler()},
+    {'backend': Backend.THREADS},
+    {'backend': Backend.PATHOS},
+])
+def test_hook_mutates_initial_state(hook, engine_options):
+    def update_x(params, substep, state_history, previous_state, policy_input):
+        return 'x', previous_state['x'] + 1
+
+    def set_initial_state(context=None):
+        context.initial_state['x'] = 100 * context.run
+
+    model = Model(initial_state={'x': 0}, state_update_blocks=[{'policies': {}, 'variables': {'x': update_x}}], params={'a': [1]})
+    experiment = Experiment(Simulation(model=model, timesteps=2, runs=3))
+    experiment.engine = Engine(**engine_options)
+    setattr(experiment, hook, set_initial_state)
+    result = experiment.run()
+
+    # Each run is executed with the initial state set by the hooks called before it
+    assert [record['x'] for record in result if record['timestep'] == 2] == [2, 102, 202]
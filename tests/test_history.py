@@ -0,0 +1,135 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from radcad.history import StateHistory
+from tests.test_cases import basic
+
+from collections import deque
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def update_lagged(params, substep, state_history, previous_state, policy_input):
+    assert len(state_history) <= 2
+    return 'lagged', state_history[-2][-1]['b'] if len(state_history) > 1 else 0.0
+
+states = {**basic.states, 'lagged': 0.0}
+state_update_blocks = [
+    *basic.state_update_blocks,
+    {
+        'policies': {},
+        'variables': {
+            'lagged': update_lagged,
+        }
+    },
+]
+TIMESTEPS = 10
+RUNS = 2
+
+
+@pytest.mark.parametrize("drop_substeps", [False, True])
+def test_history_window(drop_substeps):
+    model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=basic.params)
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS, drop_substeps=drop_substeps, history_window=2))
+    df = pd.DataFrame(experiment.run())
+
+    df_final = df.query('substep == 3')
+    assert list(df_final.query('run == 1 and subset == 0')['lagged'])[2:] == list(df_final.query('run == 1 and subset == 0')['b'])[:-2]
+
+    # The results are unchanged by the history window
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, drop_substeps=drop_substeps, history_window=0)
+    model.state_update_blocks = basic.state_update_blocks
+    model.initial_state = basic.states
+    df_no_history = pd.DataFrame(experiment.run())
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, drop_substeps=drop_substeps)
+    assert df_no_history.equals(pd.DataFrame(experiment.run()))
+
+
+def test_history_window_invalid():
+    model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=basic.params)
+    experiment = Experiment(Simulation(model=model, timesteps=TIMESTEPS), engine=Engine(history_window=-1))
+    with pytest.raises(Exception):
+        experiment.run()
+
+
+def test_state_history():
+    history = StateHistory(deque(maxlen=3))
+    for timestep in range(10):
+        history.append([{'x': timestep, 'y': [timestep]}])
+        assert history.get('x') == timestep
+
+    assert history.get('x', lag=3) == 7
+    assert list(history.series('x')) == [7, 8, 9]
+    assert list(history.series('x', last=2)) == [8, 9]
+    assert history.series('x').dtype == np.int64
+    assert history.get('y', lag=2) == [8]
+    with pytest.raises(IndexError):
+        history.get('x', lag=4)
+    with pytest.raises(ValueError):
+        history.series('x')[0] = 0
+
+    # Values are promoted to a common dtype, or fall back to an object array
+    history.append([{'x': 0.5, 'y': None}])
+    assert list(history.series('x')) == [8.0, 9.0, 0.5]
+    # `get` returns the recorded value itself, as `state_history[-lag][-1][key]` does
+    assert type(history.get('x', lag=2)) is int
+    history.append([{'x': np.zeros(2), 'y': None}])
+    assert history.series('x').dtype == object
+    assert len(history) == 3
+
+
+def moving_average(params, substep, state_history, previous_state, policy_input):
+    return 'average', state_history.series('b', last=3).mean()
+
+def lagged(params, substep, state_history, previous_state, policy_input):
+    return 'lagged', state_history.get('b', lag=2) if len(state_history) > 1 else 0.0
+
+def moving_average_list(params, substep, state_history, previous_state, policy_input):
+    return 'average', np.mean([substeps[-1]['b'] for substeps in state_history[-3:]])
+
+def lagged_list(params, substep, state_history, previous_state, policy_input):
+    return 'lagged', state_history[-2][-1]['b'] if len(state_history) > 1 else 0.0
+
+
+@pytest.mark.parametrize("history_window", [None, 3])
+@pytest.mark.parametrize("save_every", [1, 2])
+def test_state_history_accessor(history_window, save_every):
+    def run(average, lag):
+        model = Model(
+            initial_state={**basic.states, 'average': 0.0, 'lagged': 0.0},
+            state_update_blocks=[
+                *basic.state_update_blocks,
+                {'policies': {}, 'variables': {'average': average, 'lagged': lag}},
+            ],
+            params=basic.params,
+        )
+        experiment = Experiment(Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS))
+        experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, history_window=history_window, save_every=save_every)
+        return pd.DataFrame(experiment.run())
+
+    assert run(moving_average, lagged).equals(run(moving_average_list, lagged_list))
+
+
+def update_x(params, substep, state_history, previous_state, policy_input):
+    return 'x', previous_state['x'] + 1
+
+def update_window(params, substep, state_history, previous_state, policy_input):
+    return 'window', state_history.series('x', last=2)
+
+
+@pytest.mark.parametrize("history_window", [None, 2])
+def test_state_history_series_stored_in_state(history_window):
+    model = Model(
+        initial_state={'x': 0, 'window': None},
+        state_update_blocks=[{'policies': {}, 'variables': {'x': update_x, 'window': update_window}}],
+        params={},
+    )
+    experiment = Experiment(Simulation(model=model, timesteps=TIMESTEPS))
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, history_window=history_window)
+    result = experiment.run()
+
+    # The series stored in the state are unchanged by later timesteps
+    for record in result[2:]:
+        assert list(record['window']) == [record['timestep'] - 2, record['timestep'] - 1]
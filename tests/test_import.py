@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+
+def test_lazy_backend_imports():
+    # Execution backends are only imported when selected
+    modules = subprocess.check_output([
+        sys.executable,
+        "-c",
+        "import sys, radcad; print(sorted(m for m in ('ray', 'pathos', 'dill') if m in sys.modules))",
+    ])
+    assert modules.decode().strip() == "[]"
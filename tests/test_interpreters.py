@@ -0,0 +1,40 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend, _interpreters_supported
+from tests.test_cases import basic
+
+import asyncio
+import pytest
+
+
+model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+simulation = Simulation(model=model, timesteps=10, runs=3)
+
+
+def test_interpreters():
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    results = experiment.run()
+
+    # Falls back to the PATHOS backend when sub-interpreters are not supported
+    experiment.engine = Engine(backend=Backend.INTERPRETERS, processes=2)
+    assert experiment.run() == results
+    assert asyncio.run(experiment.run_async()) == results
+
+
+@pytest.mark.skipif(_interpreters_supported(), reason="sub-interpreters are supported")
+def test_interpreters_fallback():
+    assert Engine(backend=Backend.INTERPRETERS)._execution_backend() == Backend.PATHOS
+
+
+def test_interpreter_task():
+    experiment = Experiment(simulation)
+    experiment.engine._prepare(experiment)
+    _run_args, _models, _chunks, tasks, components, _keys, _cached = experiment.engine._plan()
+
+    run, block, shared, load = Engine._executor_task(Backend.INTERPRETERS, components)
+    try:
+        index, results, durations = load(run((*tasks[0], shared)))
+    finally:
+        Engine._unpublish(block)
+    assert index == 0
+    assert results == Engine._proxy_single_run((*tasks[0], components))[1]
+    assert isinstance(run((*tasks[0], components)), bytes)
@@ -1,7 +1,9 @@
 from radcad import Model, Simulation, Experiment
 from radcad.engine import Engine, Backend
+from radcad.state import copy_value, register_copy_strategy
 
 import pytest
+import numpy as np
 import pandas as pd
 
 
@@ -86,3 +88,99 @@ def test_state_mutation_no_deepcopy():
     assert not 1 in df.iloc[10]['a']
     assert not 1 in df.iloc[0]['b']
     assert not 1 in df.iloc[10]['b']
+
+def update_array(params, substep, state_history, previous_state, policy_input):
+    array = previous_state['array']
+    array += 1
+    return 'array', array
+
+def test_state_mutation_numpy():
+    initial_state = {
+        'array': np.zeros(3),
+    }
+
+    state_update_blocks = [
+        {
+            'policies': {},
+            'variables': {
+                'array': update_array,
+            }
+        },
+    ]
+
+    model = Model(initial_state=initial_state, state_update_blocks=state_update_blocks, params={})
+    simulation = Simulation(model=model, timesteps=10)
+    experiment = Experiment(simulation)
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+
+    result = experiment.run()
+
+    assert [record['array'][0] for record in result] == list(range(11))
+
+class Counter:
+    copies = 0
+
+    def __init__(self, count=0):
+        self.count = count
+
+    def __radcad_copy__(self):
+        Counter.copies += 1
+        return Counter(self.count)
+
+def update_counter(params, substep, state_history, previous_state, policy_input):
+    counter = previous_state['counter']
+    counter.count += 1
+    return 'counter', counter
+
+def update_lookup(params, substep, state_history, previous_state, policy_input):
+    previous_state['lookup'].append(1)
+    return 'lookup', previous_state['lookup']
+
+def test_copy_strategies():
+    initial_state = {
+        'counter': Counter(),
+        'lookup': [],
+        'unused': [],
+    }
+
+    state_update_blocks = [
+        {
+            'policies': {},
+            'variables': {
+                'counter': update_counter,
+                'lookup': update_lookup,
+            }
+        },
+    ]
+
+    model = Model(
+        initial_state=initial_state,
+        state_update_blocks=state_update_blocks,
+        params={},
+        copy_strategies={'lookup': None}
+    )
+    simulation = Simulation(model=model, timesteps=10)
+    experiment = Experiment(simulation)
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS)
+
+    result = experiment.run()
+
+    assert [record['counter'].count for record in result] == list(range(11))
+    assert Counter.copies == 10
+    # Opted out of copying, so mutation is shared across records
+    assert result[0]['lookup'] is result[-1]['lookup']
+    assert len(result[0]['lookup']) == 10
+
+class Immutable:
+    pass
+
+def test_register_copy_strategy():
+    value = Immutable()
+    assert copy_value(value) is not value
+    register_copy_strategy(Immutable, None)
+    assert copy_value(value) is value
+
+    value = (1, 'a')
+    assert copy_value(value) is value
+    value = ([],)
+    assert copy_value(value)[0] is not value[0]
@@ -0,0 +1,38 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from tests.test_cases import basic
+
+import os
+import pytest
+
+
+def update_pid(params, substep, state_history, previous_state, policy_input):
+    return 'pid', os.getpid()
+
+model = Model(
+    initial_state={**basic.states, 'pid': 0},
+    state_update_blocks=[*basic.state_update_blocks, {'policies': {}, 'variables': {'pid': update_pid}}],
+    params=basic.params,
+)
+simulation = Simulation(model=model, timesteps=10, runs=2)
+
+
+@pytest.mark.parametrize("backend", [Backend.PATHOS, Backend.MULTIPROCESSING])
+def test_persistent_pool(backend):
+    with Engine(backend=backend, persistent_pool=True, processes=2) as engine:
+        experiment = Experiment(simulation, engine=engine)
+        pids = {result['pid'] for result in experiment.run()}
+        assert engine.time_to_first_result > 0
+        pool = engine._pool
+
+        # The worker processes are reused by the next run
+        pids |= {result['pid'] for result in experiment.run()}
+        assert len(pids - {0}) <= 2
+        assert engine._pool is pool
+    assert engine._pool is None
+
+
+def test_pool_closed():
+    engine = Engine(backend=Backend.PATHOS, processes=2)
+    Experiment(simulation, engine=engine).run()
+    assert engine._pool is None
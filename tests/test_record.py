@@ -0,0 +1,63 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from tests.test_cases import basic
+
+import pandas as pd
+import pytest
+
+
+def update_scratch(params, substep, state_history, previous_state, policy_input):
+    return 'scratch', list(range(previous_state['timestep'] + 1))
+
+def update_c(params, substep, state_history, previous_state, policy_input):
+    return 'c', len(previous_state['scratch'])
+
+states = {**basic.states, 'scratch': [], 'c': 0}
+state_update_blocks = [
+    {
+        'policies': {},
+        'variables': {
+            'scratch': update_scratch,
+        }
+    },
+    *basic.state_update_blocks,
+    {
+        'policies': {},
+        'variables': {
+            'c': update_c,
+        }
+    },
+]
+TIMESTEPS = 10
+RUNS = 2
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("save_every", [1, 3])
+def test_exclude(columnar, save_every):
+    model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=basic.params)
+    experiment = Experiment(Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS))
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, save_every=save_every)
+    df = pd.DataFrame(experiment.run()).drop(columns=['scratch'])
+
+    for recorded_model in [
+        Model(initial_state=states, state_update_blocks=state_update_blocks, params=basic.params, exclude=['scratch']),
+        Model(initial_state=states, state_update_blocks=state_update_blocks, params=basic.params, record=['a', 'b', 'c']),
+    ]:
+        experiment = Experiment(Simulation(model=recorded_model, timesteps=TIMESTEPS, runs=RUNS))
+        experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, columnar=columnar, save_every=save_every)
+        results = experiment.run()
+        df_recorded = results.to_dataframe() if columnar else pd.DataFrame(results)
+
+        # Excluded state variables are still available to the state update blocks
+        assert df_recorded[df.columns].equals(df)
+        assert 'scratch' not in df_recorded
+
+
+def test_record_invalid():
+    with pytest.raises(Exception):
+        Model(initial_state=states, record=['a'], exclude=['b'])
+
+    model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=basic.params, exclude=['d'])
+    with pytest.raises(KeyError):
+        Simulation(model=model, timesteps=TIMESTEPS).run()
@@ -0,0 +1,77 @@
+from radcad import Model, Simulation, Experiment, Engine, Context
+from radcad.engine import Backend
+from tests.test_cases import basic
+
+import asyncio
+import time
+import pytest
+
+
+TIMESTEPS = 10
+RUNS = 3
+
+model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+
+
+def update_slow(params, substep, state_history, previous_state, policy_input):
+    time.sleep(0.1)
+    return 'a', previous_state['a']
+
+slow_model = Model(
+    initial_state=basic.states,
+    state_update_blocks=[{'policies': {}, 'variables': {'a': update_slow}}],
+    params={},
+)
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS, Backend.MULTIPROCESSING, Backend.RAY])
+def test_run_async(backend):
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    results = experiment.run()
+
+    experiment.engine = Engine(backend=backend, processes=2)
+    assert asyncio.run(experiment.run_async()) == results
+    assert len(experiment.exceptions) == RUNS * 2
+
+    async def run_iter(ordered):
+        return [(context, result) async for context, result in experiment.run_iter_async(ordered=ordered)]
+
+    ordered_results = asyncio.run(run_iter(ordered=True))
+    assert all(isinstance(context, Context) for context, _result in ordered_results)
+    assert [record for _context, result in ordered_results for record in result] == results
+
+    completed = [(context.run, context.subset) for context, _result in asyncio.run(run_iter(ordered=False))]
+    assert sorted(completed) == [(run, subset) for run in range(RUNS) for subset in range(2)]
+
+
+def test_concurrent_experiments():
+    engine = Engine(backend=Backend.PATHOS, processes=2, persistent_pool=True)
+    experiments = [Experiment(Simulation(model=model, timesteps=TIMESTEPS, runs=runs), engine=engine) for runs in [1, 2, 3]]
+
+    async def run():
+        return await asyncio.gather(*[experiment.run_async() for experiment in experiments])
+
+    with engine:
+        results = asyncio.run(run())
+    assert results == [Experiment(experiment.simulations, engine=Engine(backend=Backend.SINGLE_PROCESS)).run() for experiment in experiments]
+    assert engine._pool is None
+
+
+@pytest.mark.parametrize("backend", [Backend.PATHOS, Backend.MULTIPROCESSING])
+def test_cancel_run_async(backend):
+    experiment = Experiment(Simulation(model=slow_model, timesteps=100, runs=4), engine=Engine(backend=backend, processes=2))
+
+    async def run():
+        task = asyncio.ensure_future(experiment.run_async())
+        # The event loop is not blocked by the experiment
+        await asyncio.sleep(0.5)
+        assert not task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.time()
+    asyncio.run(run())
+    assert time.time() - start < 10
+    assert experiment.engine._pool is None
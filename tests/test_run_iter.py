@@ -0,0 +1,52 @@
+from radcad import Model, Simulation, Experiment, Engine, Context
+from radcad.engine import Backend
+from radcad.utils import reorder
+from tests.test_cases import basic
+
+import pytest
+
+
+states = basic.states
+state_update_blocks = basic.state_update_blocks
+params = basic.params
+TIMESTEPS = 10
+RUNS = 3
+
+model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=params)
+
+
+def test_reorder():
+    assert list(reorder([(2, 'c'), (0, 'a'), (3, 'd'), (1, 'b')])) == [(0, 'a'), (1, 'b'), (2, 'c'), (3, 'd')]
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS, Backend.MULTIPROCESSING])
+def test_run_iter(backend):
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation, engine=Engine(backend=backend))
+
+    results = experiment.run()
+
+    ordered_results = []
+    for context, result in experiment.run_iter(ordered=True):
+        assert isinstance(context, Context)
+        assert all(record['run'] == context.run + 1 and record['subset'] == context.subset for record in result)
+        ordered_results.extend(result)
+    assert ordered_results == results
+    assert len(experiment.exceptions) == RUNS * 2
+    assert experiment.results == []
+
+    completed = [(context.run, context.subset) for context, _result in experiment.run_iter()]
+    assert sorted(completed) == [(run, subset) for run in range(RUNS) for subset in range(2)]
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS, Backend.MULTIPROCESSING])
+def test_run_iter_break(backend):
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation, engine=Engine(backend=backend))
+
+    run_iter = experiment.run_iter()
+    context, result = next(run_iter)
+    run_iter.close()
+
+    assert len(result) == TIMESTEPS * 2 + 1
+    assert len(experiment.run()) == (TIMESTEPS * 2 + 1) * RUNS * 2
@@ -0,0 +1,101 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from tests.test_cases import basic
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+TIMESTEPS = 25
+RUNS = 2
+SAVE_EVERY = 10
+
+
+def update_a(params, substep, state_history, previous_state, policy_input):
+    return 'a', previous_state['a'] * np.abs(np.cos(previous_state['a']))
+
+state_update_blocks = [
+    {
+        'policies': basic.state_update_blocks[1]['policies'],
+        'variables': {
+            'a': update_a,
+            'b': basic.update_b,
+        }
+    }
+]
+
+model = Model(initial_state=basic.states, state_update_blocks=state_update_blocks, params=basic.params)
+simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+
+
+@pytest.mark.parametrize("vectorize_runs", [False, True])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_save_every(vectorize_runs, columnar):
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS, drop_substeps=True))
+    df = pd.DataFrame(experiment.run())
+
+    experiment.engine = Engine(
+        backend=Backend.SINGLE_PROCESS,
+        drop_substeps=True,
+        columnar=columnar,
+        vectorize_runs=vectorize_runs,
+        save_every=SAVE_EVERY,
+        reducers={
+            'a_mean': ('a', 'mean'),
+            'b_max': ('b', np.max),
+        },
+    )
+    results = experiment.run()
+    df_saved = results.to_dataframe() if columnar else pd.DataFrame(results)
+    df_saved = df_saved.sort_values(['subset', 'run', 'timestep'], kind='stable').reset_index(drop=True)
+
+    assert list(df_saved.timestep.unique()) == [0, 10, 20]
+    expected = df.query('timestep % @SAVE_EVERY == 0').sort_values(['subset', 'run', 'timestep'], kind='stable')
+    columns = ['a', 'b', 'simulation', 'subset', 'run', 'substep', 'timestep']
+    assert df_saved[columns].equals(expected[columns].reset_index(drop=True))
+
+    # Reducers are computed over the window of timesteps since the last recorded timestep
+    window = df.query('subset == 1 and run == 2 and 10 < timestep <= 20')
+    recorded = df_saved.query('subset == 1 and run == 2 and timestep == 20').iloc[0]
+    assert recorded['a_mean'] == pytest.approx(window['a'].mean())
+    assert recorded['b_max'] == window['b'].max()
+    assert df_saved.query('timestep == 0')['a_mean'].eq(basic.states['a']).all()
+
+
+def test_save_every_without_drop_substeps():
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS, save_every=5))
+    df = pd.DataFrame(experiment.run())
+
+    assert set(df.timestep.unique()) == {0, 5, 10, 15, 20, 25}
+    assert len(df) == (1 + 5) * RUNS * 2
+
+
+def test_save_every_invalid():
+    experiment = Experiment(simulation, engine=Engine(save_every=0))
+    with pytest.raises(Exception):
+        experiment.run()
+
+
+def update_x(params, substep, state_history, previous_state, policy_input):
+    return 'x', previous_state['x'] + 1
+
+def update_acc(params, substep, state_history, previous_state, policy_input):
+    # Depends on the timestep before the previous timestep, whether or not it is recorded
+    lagged = state_history[-2][-1]['x'] if len(state_history) > 1 else 0
+    return 'acc', previous_state['acc'] + lagged
+
+def test_save_every_lagged_history():
+    lagged_model = Model(
+        initial_state={'x': 0, 'acc': 0},
+        state_update_blocks=[{'policies': {}, 'variables': {'x': update_x, 'acc': update_acc}}],
+        params={},
+    )
+    experiment = Experiment(Simulation(model=lagged_model, timesteps=8), engine=Engine(backend=Backend.SINGLE_PROCESS))
+    df = pd.DataFrame(experiment.run())
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, save_every=2)
+    df_saved = pd.DataFrame(experiment.run())
+
+    assert df_saved.query('timestep == 8')['acc'].iloc[0] == df.query('timestep == 8')['acc'].iloc[0] == 21
+    assert df_saved.equals(df.query('timestep % 2 == 0').reset_index(drop=True))
@@ -0,0 +1,63 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend, CostScheduler
+from tests.test_cases import basic
+
+import time
+import pytest
+
+
+def update_slow(params, substep, state_history, previous_state, policy_input):
+    time.sleep(0.005)
+    return 'a', previous_state['a']
+
+fast_model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+slow_model = Model(
+    initial_state=basic.states,
+    state_update_blocks=[{'policies': {}, 'variables': {'a': update_slow}}],
+    params={},
+)
+
+
+@pytest.mark.parametrize("backend", [Backend.SINGLE_PROCESS, Backend.PATHOS])
+def test_cost_scheduler(backend):
+    simulations = [
+        Simulation(model=slow_model, timesteps=10, runs=2),
+        Simulation(model=fast_model, timesteps=50, runs=1),
+    ]
+    experiment = Experiment(simulations, engine=Engine(backend=backend))
+    results = experiment.run()
+
+    scheduler = CostScheduler()
+    experiment.engine = Engine(backend=backend, scheduler=scheduler, chunksize=2)
+    assert experiment.run() == results
+
+    # The slow model's runs are scheduled first once its durations have been observed
+    assert len(scheduler._rates) == 2
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, scheduler=scheduler)
+    completed = [(context.simulation, context.run) for context, _result in experiment.run_iter()]
+    assert completed[:2] == [(0, 0), (0, 1)]
+
+
+def test_cost_scheduler_estimate():
+    simulations = [
+        Simulation(model=fast_model, timesteps=10, runs=1),
+        Simulation(model=fast_model, timesteps=100, runs=1),
+    ]
+    experiment = Experiment(simulations, engine=Engine(backend=Backend.SINGLE_PROCESS, scheduler=CostScheduler()))
+
+    # Without observed durations, runs with more timesteps are scheduled first
+    completed = [(context.simulation, context.subset) for context, _result in experiment.run_iter()]
+    assert completed == [(1, 0), (1, 1), (0, 0), (0, 1)]
+
+
+def test_cost_scheduler_model_key():
+    scheduler = CostScheduler()
+    # Models are identified by their state update blocks, rather than the identity of the blocks, which may be reused once freed
+    models = [
+        Model(initial_state=basic.states, state_update_blocks=list(basic.state_update_blocks), params=basic.params)
+        for _ in range(2)
+    ]
+    for model in models:
+        experiment = Experiment(Simulation(model=model, timesteps=10), engine=Engine(backend=Backend.SINGLE_PROCESS, scheduler=scheduler))
+        experiment.run()
+    assert len(scheduler._rates) == 1
@@ -0,0 +1,60 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from radcad.sinks import ParquetSink
+from tests.test_cases import basic
+
+import pandas as pd
+import pytest
+
+
+states = basic.states
+state_update_blocks = basic.state_update_blocks
+params = basic.params
+TIMESTEPS = 10
+RUNS = 3
+
+model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=params)
+simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+
+
+def read_parquet(path):
+    df = pd.read_parquet(path)
+    for key in ['simulation', 'subset', 'run']:
+        df[key] = df[key].astype('int64')
+    return df
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_parquet_sink(tmp_path, columnar):
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    df = pd.DataFrame(experiment.run())
+
+    path = tmp_path / 'results'
+    experiment.engine = Engine(sink=ParquetSink(str(path)), columnar=columnar)
+    assert len(experiment.run()) == 0
+    assert len(experiment.exceptions) == RUNS * 2
+    assert (path / 'simulation=0' / 'subset=1' / 'run=3').is_dir()
+
+    df_parquet = read_parquet(path).sort_values(['run', 'subset', 'timestep', 'substep']).reset_index(drop=True)
+    assert df_parquet[df.columns].equals(df)
+
+
+def test_parquet_sink_run_iter(tmp_path):
+    path = tmp_path / 'results'
+    experiment = Experiment(simulation, engine=Engine(sink=ParquetSink(str(path), partition_by=['simulation'])))
+
+    rows = sum(len(result) for _context, result in experiment.run_iter())
+
+    assert len(read_parquet(path)) == rows
+
+
+def test_sink_error(tmp_path):
+    class FailingSink(ParquetSink):
+        def _write(self, context, result):
+            raise Exception("Forced exception from sink")
+
+    experiment = Experiment(simulation, engine=Engine(sink=FailingSink(str(tmp_path)), backend=Backend.SINGLE_PROCESS))
+
+    with pytest.raises(Exception) as e:
+        experiment.run()
+    assert str(e.value) == "Forced exception from sink"
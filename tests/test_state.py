@@ -0,0 +1,94 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from radcad.state import CopyOnWriteState
+import radcad.core
+
+import json
+import pandas as pd
+import pytest
+
+
+def test_copy_on_write_state():
+    base = {'a': 1, 'b': 2}
+    state = CopyOnWriteState(base)
+    state['a'] = 10
+    assert state == {'a': 10, 'b': 2}
+    assert base == {'a': 1, 'b': 2}
+
+    state_copy = state.copy()
+    state_copy['b'] = 20
+    state_copy['c'] = 30
+    assert state == {'a': 10, 'b': 2}
+    assert state_copy == {'a': 10, 'b': 20, 'c': 30}
+    assert list(state_copy) == ['a', 'b', 'c']
+    assert len(state_copy) == 3
+
+    del state_copy['a']
+    assert state_copy.to_dict() == {'b': 20, 'c': 30}
+    assert state == {'a': 10, 'b': 2}
+
+
+def update_a(params, substep, state_history, previous_state, policy_input):
+    previous_state['b'] = -1
+    return 'a', previous_state['a'] + 1
+
+def update_b(params, substep, state_history, previous_state, policy_input):
+    return 'b', previous_state['b'] + 1
+
+@pytest.mark.parametrize("copy_on_write_state_size", [0, radcad.core.COPY_ON_WRITE_STATE_SIZE])
+def test_substate_isolation(monkeypatch, copy_on_write_state_size):
+    monkeypatch.setattr(radcad.core, "COPY_ON_WRITE_STATE_SIZE", copy_on_write_state_size)
+    initial_state = {
+        'a': 0,
+        'b': 0
+    }
+
+    state_update_blocks = [
+        {
+            'policies': {},
+            'variables': {
+                'a': update_a,
+            }
+        },
+        {
+            'policies': {},
+            'variables': {
+                'b': update_b,
+            }
+        },
+    ]
+
+    model = Model(initial_state=initial_state, state_update_blocks=state_update_blocks, params={})
+    simulation = Simulation(model=model, timesteps=10)
+    experiment = Experiment(simulation)
+
+    for deepcopy in [True, False]:
+        experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, deepcopy=deepcopy)
+        result = experiment.run()
+        assert all(type(record) == dict for record in result)
+
+        df = pd.DataFrame(result)
+        assert list(df['a']) == [0] + [timestep for timestep in range(1, 11) for _ in range(2)]
+        assert list(df['b']) == [0] + [timestep + substep for timestep in range(10) for substep in range(2)]
+
+
+@pytest.mark.parametrize("deepcopy", [True, False])
+@pytest.mark.parametrize("copy_on_write_state_size", [0, radcad.core.COPY_ON_WRITE_STATE_SIZE])
+def test_substate_type(monkeypatch, deepcopy, copy_on_write_state_size):
+    monkeypatch.setattr(radcad.core, "COPY_ON_WRITE_STATE_SIZE", copy_on_write_state_size)
+
+    def update_json(params, substep, state_history, previous_state, policy_input):
+        # Functions receive a plain dict
+        assert type(previous_state) == dict
+        return 'json', json.dumps({key: previous_state[key] for key in ['a', 'timestep']})
+
+    def update_increment(params, substep, state_history, previous_state, policy_input):
+        return 'a', previous_state['a'] + 1
+
+    model = Model(
+        initial_state={'a': 0, 'json': ''},
+        state_update_blocks=[{'policies': {}, 'variables': {'a': update_increment, 'json': update_json}}],
+        params={},
+    )
+    experiment = Experiment(Simulation(model=model, timesteps=3), engine=Engine(backend=Backend.SINGLE_PROCESS, deepcopy=deepcopy))
+    assert pd.DataFrame(experiment.run())['json'].iloc[-1] == '{"a": 2, "timestep": 2}'
@@ -1,4 +1,5 @@
-from radcad import Model, Simulation, Experiment
+from radcad import Model, Simulation, Experiment, Engine
+from radcad.core import ExecutionPlan
 from tests.test_cases import basic
 import pytest
 
@@ -21,6 +22,8 @@ def test_invalid_state_update_function():
     model = Model(initial_state=states, state_update_blocks=state_update_blocks, params=params)
     simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
     experiment = Experiment(simulation)
+    # The state keys returned by state update functions are only validated in debug mode
+    experiment.engine = Engine(debug=True)
 
     with pytest.raises(KeyError) as err:
         experiment.run()
@@ -47,3 +50,17 @@ def test_invalid_state():
 
     with pytest.raises(KeyError) as err:
         experiment.run()
+
+def test_compile():
+    model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+    plan = model.compile()
+
+    assert isinstance(plan, ExecutionPlan)
+    assert len(plan) == len(basic.state_update_blocks)
+    policies, variables, reduce_policies = plan[1]
+    assert policies == tuple(basic.state_update_blocks[1]['policies'].values())
+    assert variables == (('b', basic.update_b),)
+
+    model.state_update_blocks = [{'policies': {}, 'variables': {'c': basic.update_a}}]
+    with pytest.raises(KeyError):
+        model.compile()
@@ -0,0 +1,68 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+from tests.test_cases import basic
+
+import asyncio
+import numpy as np
+import pandas as pd
+
+
+TIMESTEPS = 10
+RUNS = 5
+
+model = Model(initial_state=basic.states, state_update_blocks=basic.state_update_blocks, params=basic.params)
+
+
+def test_threads():
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation, engine=Engine(backend=Backend.SINGLE_PROCESS))
+    results = experiment.run()
+
+    experiment.engine = Engine(backend=Backend.THREADS, processes=4)
+    assert experiment.run() == results
+    assert experiment.engine._pool is None
+    assert asyncio.run(experiment.run_async()) == results
+
+    with Engine(backend=Backend.THREADS, processes=4, persistent_pool=True) as engine:
+        experiment.engine = engine
+        assert experiment.run() == results
+        assert experiment.run() == results
+        assert engine._pool is not None
+    assert engine._pool is None
+
+
+def policy_mutate(params, substep, state_history, previous_state):
+    # Each run has its own copy of the parameters and initial state, shared by none of the other threads
+    params['table'].append(previous_state['run'])
+    previous_state['array'] += 1
+    return {'length': len(params['table'])}
+
+def update_length(params, substep, state_history, previous_state, policy_input):
+    return 'length', policy_input['length']
+
+def update_array(params, substep, state_history, previous_state, policy_input):
+    array = previous_state['array']
+    array[0] += 1
+    return 'array', array
+
+def test_threads_mutation_isolation():
+    mutating_model = Model(
+        initial_state={'length': 0, 'array': np.zeros(3)},
+        state_update_blocks=[
+            {'policies': {'mutate': policy_mutate}, 'variables': {'length': update_length}},
+            {'policies': {}, 'variables': {'array': update_array}},
+        ],
+        params={'table': [[]]},
+    )
+    experiment = Experiment(
+        Simulation(model=mutating_model, timesteps=TIMESTEPS, runs=RUNS),
+        engine=Engine(backend=Backend.THREADS, processes=4),
+    )
+    df = pd.DataFrame(experiment.run())
+
+    # The parameters of each run are only mutated by that run
+    assert (df.groupby('run')['length'].max() == TIMESTEPS).all()
+    # With deepcopy, in-place mutations of the previous state are not visible to other substeps or runs
+    assert (df[df.timestep == TIMESTEPS].query('substep == 2')['array'].apply(lambda array: array[0]) == TIMESTEPS).all()
+    assert mutating_model.initial_state['array'].sum() == 0
+    assert mutating_model.params == {'table': [[]]}
@@ -0,0 +1,114 @@
+from radcad import Model, Simulation, Experiment
+from radcad.engine import Engine, Backend
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def policy(params, substep, state_history, previous_state):
+    return {'step_size': params['step_size']}
+
+def update_a(params, substep, state_history, previous_state, policy_input):
+    return 'a', previous_state['a'] * np.abs(np.cos(previous_state['a']))
+
+def update_b(params, substep, state_history, previous_state, policy_input):
+    return 'b', previous_state['b'] + policy_input['step_size']
+
+def update_noise(params, substep, state_history, previous_state, policy_input):
+    noise = previous_state['noise']
+    return 'noise', noise + np.random.normal(size=np.shape(noise))
+
+initial_state = {
+    'a': 1.0,
+    'b': 2,
+    'noise': 0.0,
+    'label': 'shared',
+}
+
+state_update_blocks = [
+    {
+        'policies': {},
+        'variables': {
+            'a': update_a
+        }
+    },
+    {
+        'policies': {
+            'p': policy
+        },
+        'variables': {
+            'b': update_b,
+            'noise': update_noise,
+        }
+    }
+]
+
+params = {
+    'step_size': [1, 2]
+}
+
+TIMESTEPS = 10
+RUNS = 5
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_vectorize_runs(columnar):
+    model = Model(initial_state=initial_state, state_update_blocks=state_update_blocks, params=params)
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation)
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, columnar=columnar)
+    results = experiment.run()
+    df = results.to_dataframe() if columnar else pd.DataFrame(results)
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, columnar=columnar, vectorize_runs=True)
+    vectorized_results = experiment.run()
+    df_vectorized = vectorized_results.to_dataframe() if columnar else pd.DataFrame(vectorized_results)
+
+    assert len(experiment.exceptions) == RUNS * len(params['step_size'])
+    assert [(exception['run'], exception['subset']) for exception in experiment.exceptions] == [
+        (run, subset) for subset in range(2) for run in range(RUNS)
+    ]
+
+    # Results are ordered by subset, and then by run
+    df_vectorized = df_vectorized.sort_values(['run', 'subset'], kind='stable').reset_index(drop=True)
+    columns = ['a', 'b', 'label', 'simulation', 'subset', 'run', 'substep', 'timestep']
+    assert df_vectorized[columns].equals(df[columns])
+
+    # Each Monte Carlo run receives different random noise
+    final_noise = df_vectorized.query('timestep == @TIMESTEPS and substep == 2 and subset == 0')['noise']
+    assert len(set(final_noise)) == RUNS
+
+@pytest.mark.parametrize("vectorize_runs", [False, True])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_vectorize_subsets(vectorize_runs, columnar):
+    sweep = {
+        'step_size': [1, 2, 3],
+        'unused': [0],
+    }
+    model = Model(initial_state=initial_state, state_update_blocks=state_update_blocks, params=sweep)
+    simulation = Simulation(model=model, timesteps=TIMESTEPS, runs=RUNS)
+    experiment = Experiment(simulation)
+
+    experiment.engine = Engine(backend=Backend.SINGLE_PROCESS, columnar=columnar)
+    results = experiment.run()
+    df = results.to_dataframe() if columnar else pd.DataFrame(results)
+
+    experiment.engine = Engine(
+        backend=Backend.SINGLE_PROCESS,
+        columnar=columnar,
+        vectorize_runs=vectorize_runs,
+        vectorize_subsets=True
+    )
+    vectorized_results = experiment.run()
+    df_vectorized = vectorized_results.to_dataframe() if columnar else pd.DataFrame(vectorized_results)
+
+    assert sorted((exception['run'], exception['subset']) for exception in experiment.exceptions) == [
+        (run, subset) for run in range(RUNS) for subset in range(3)
+    ]
+
+    df_vectorized = df_vectorized.sort_values(['run', 'subset'], kind='stable').reset_index(drop=True)
+    columns = ['a', 'b', 'label', 'simulation', 'subset', 'run', 'substep', 'timestep']
+    assert df_vectorized[columns].equals(df[columns])
+    assert list(df_vectorized.query('timestep == @TIMESTEPS and substep == 2 and run == 1')['b']) == [12, 22, 32]